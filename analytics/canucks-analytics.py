@@ -0,0 +1,33 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+import analytics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Win rate by rest, time zone shift, road trip length and opponent.")
+    parser.add_argument("cube", nargs="?", choices=analytics.CUBE_NAMES, help="Cube to print (default: all)")
+    parser.add_argument("--data-dir", default=".", help="Directory holding canucks_game_history_*.csv")
+    parser.add_argument("--filter", action="append", default=[], metavar="COLUMN=VALUE", help="Filter the cube, e.g. Season=2022-2023")
+    args = parser.parse_args()
+    if args.filter and not args.cube:
+        parser.error("--filter needs a cube, e.g. opponent_season --filter Season=2022-2023")
+
+    filters = {}
+    for item in args.filter:
+        column, _, value = item.partition("=")
+        filters.setdefault(column, []).append(value)
+
+    for cube_name in [args.cube] if args.cube else analytics.CUBE_NAMES:
+        try:
+            cube = analytics.query(cube_name, args.data_dir, filters if args.cube else None)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"\n== {cube_name} ==")
+        print(cube.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import glob
+import importlib.util
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(os.path.join(REPO_DIR, "common"))
+
+from team_mapping import nhl_team_mapping
+
+# Team whose games the streamed season files hold
+TEAM_ID = 23
+
+
+# Function to load one of the hyphenated scripts by path
+def load_script(name, *path):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(REPO_DIR, *path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+add_city = load_script("add_city", "data-conversion", "add-city.py")
+
+
+def synthetic_games(rows, seed=0):
+    """
+    Builds a Canucks-style merged dataset with `rows` games against random opponents.
+    """
+    rng = np.random.default_rng(seed)
+    opponents = [name for name in nhl_team_mapping if name != "Vancouver Canucks"]
+    opponent = np.array(opponents, dtype=object)[rng.integers(0, len(opponents), rows)]
+    to_coordinates = np.array([nhl_team_mapping[name]["coordinates"] for name in opponent])
+    home_lat, home_lon = nhl_team_mapping["Vancouver Canucks"]["coordinates"]
+
+    return pd.DataFrame({
+        "Game Location": np.where(rng.random(rows) < 0.5, "Home", "Away"),
+        "Opponent Team": opponent,
+        "From (Latitude)": home_lat,
+        "From (Longitude)": home_lon,
+        "To (Latitude)": to_coordinates[:, 0],
+        "To (Longitude)": to_coordinates[:, 1],
+    })
+
+
+def legacy_enrich(df):
+    """
+    The previous row-wise implementation, kept here as the baseline.
+    """
+    df["City"] = df.apply(
+        lambda row: "Vancouver" if row["Game Location"] == "Home" else add_city.extract_city(row["Opponent Team"]),
+        axis=1
+    )
+    df["Normalized_City"] = df["City"].apply(add_city.normalize_city_name)
+    df["State/Province"] = df["Normalized_City"].map(add_city.city_to_state)
+    df["City_Latitude"] = df.apply(
+        lambda row: row["From (Latitude)"] if row["Game Location"] == "Home" else row["To (Latitude)"], axis=1
+    )
+    df["City_Longitude"] = df.apply(
+        lambda row: row["From (Longitude)"] if row["Game Location"] == "Home" else row["To (Longitude)"], axis=1
+    )
+    return df.drop(columns=["Normalized_City"])
+
+
+# Function to time one enrichment implementation on a fresh copy of the data
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df.copy())
+    return time.perf_counter() - start, result
+
+
+def write_season_files(data_dir, seasons, games_per_season):
+    """
+    Writes per-season CSVs through canucks-iterate.py's own save_to_csv, from
+    the fake API's synthetic games, so the streamed input has exactly the
+    columns a real run produces. Team names come from the fake API's list,
+    so nothing is fetched.
+
+    :return: Paths of the written files
+    """
+    import team_directory
+    from fake_nhl_api import TEAMS, synthetic_season
+
+    iterate = load_script("canucks_iterate", "iterative-seasons", "canucks-iterate.py")
+    team_directory.set_teams([{"id": team_id, "fullName": name} for team_id, name in TEAMS])
+
+    cwd = os.getcwd()
+    os.chdir(data_dir)
+    try:
+        for start_year in range(2024 - seasons, 2024):
+            games = [
+                game for game in synthetic_season(start_year, games_per_season)
+                if TEAM_ID in (game["homeTeamId"], game["visitingTeamId"])
+            ]
+            season = iterate.get_season_id(start_year)
+            iterate.save_to_csv(iterate.process_travel(iterate.build_game_rows(games, TEAM_ID, season)), season)
+    finally:
+        os.chdir(cwd)
+    return sorted(glob.glob(os.path.join(data_dir, "canucks_game_history_*.csv")))
+
+
+def time_stream(seasons, rows_per_season, chunk_rows, output_format="csv"):
+    """
+    Writes `seasons` per-season CSVs and enriches them with
+    add_city.stream_enrich, reporting how far peak RSS grew while streaming.
+    """
+    data_dir = tempfile.mkdtemp(prefix="canucks-add-city-bench-")
+    paths = write_season_files(data_dir, seasons, rows_per_season)
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    rows = add_city.stream_enrich(paths, os.path.join(data_dir, f"enriched.{output_format}"), chunk_rows)
+    elapsed = time.perf_counter() - start
+    growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) / 1024
+    print(f"streamed:   {rows:>9} rows  {elapsed:8.3f}s  {rows / elapsed:>12,.0f} rows/s  peak RSS +{growth:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark add-city.py enrichment on synthetic data.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=100_000, help="Rows for the slow row-wise baseline (0 to skip)")
+    parser.add_argument("--stream-seasons", type=int, default=0,
+                        help="Benchmark only --stream mode over this many per-season files of --rows rows each")
+    parser.add_argument("--chunk-rows", type=int, default=add_city.CHUNK_ROWS)
+    parser.add_argument("--stream-format", choices=["csv", "parquet"], default="csv", help="Output format in --stream-seasons mode")
+    args = parser.parse_args()
+
+    if args.stream_seasons:
+        time_stream(args.stream_seasons, args.rows, args.chunk_rows, args.stream_format)
+        return
+
+    df = synthetic_games(args.rows)
+    elapsed, enriched = timed(add_city.enrich, df)
+    print(f"vectorized: {args.rows:>9} rows  {elapsed:8.3f}s  {args.rows / elapsed:>12,.0f} rows/s")
+
+    if args.legacy_rows:
+        sample = df.head(args.legacy_rows)
+        legacy_elapsed, legacy = timed(legacy_enrich, sample)
+        print(f"row-wise:   {len(sample):>9} rows  {legacy_elapsed:8.3f}s  {len(sample) / legacy_elapsed:>12,.0f} rows/s")
+
+        columns = ["City", "State/Province", "City_Latitude", "City_Longitude"]
+        same = legacy[columns].equals(enriched.head(len(sample))[columns])
+        print(f"outputs match on the baseline sample: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import urllib.parse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+
+# Keep the benchmark away from the real cache directory
+os.environ.setdefault("CANUCKS_CACHE_DIR", tempfile.mkdtemp(prefix="canucks-bench-"))
+
+import fetch_engine
+import http_cache
+from fake_nhl_api import FakeNHLApi
+
+TEAM_ID = 23
+
+
+# Function to build the per-season /game URL the same way canucks-iterate.py does
+def season_url(base_url, start_year):
+    query = (
+        f"(homeTeamId={TEAM_ID} or visitingTeamId={TEAM_ID}) "
+        f"and gameDate>='{start_year}-10-01' and gameDate<='{start_year + 1}-04-15'"
+    )
+    return f"{base_url}/game?cayenneExp={urllib.parse.quote(query)}"
+
+
+def run(api, seasons, concurrency, rate):
+    http_cache.clear()
+    fetch_engine.configure(concurrency=concurrency, rate=rate, burst=concurrency)
+    requests_before = api.request_count
+
+    start = time.perf_counter()
+    responses = fetch_engine.run_concurrently(
+        lambda start_year: fetch_engine.get(season_url(api.base_url, start_year)), seasons
+    )
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for response in responses if response.status_code != 200)
+    return elapsed, api.request_count - requests_before, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Season fetch throughput vs concurrency against a local fake API.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds of simulated server latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429/503")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Token bucket rate in requests per second")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 14])
+    args = parser.parse_args()
+
+    seasons = range(2010, 2024)
+    api = FakeNHLApi(first_season=2010, last_season=2023, latency=args.latency, error_rate=args.error_rate).start()
+    fetch_engine.BACKOFF_BASE = 0.05
+
+    print(f"{'concurrency':>11}  {'seconds':>8}  {'requests':>8}  {'failed':>6}  {'seasons/s':>9}")
+    for concurrency in args.concurrency:
+        elapsed, request_count, failed = run(api, seasons, concurrency, args.rate)
+        print(f"{concurrency:>11}  {elapsed:>8.3f}  {request_count:>8}  {failed:>6}  {len(seasons) / elapsed:>9.2f}")
+
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
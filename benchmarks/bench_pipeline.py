@@ -0,0 +1,263 @@
+import argparse
+import csv
+import glob
+import importlib.util
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.join(BENCH_DIR, "..")
+sys.path.append(os.path.join(REPO_DIR, "common"))
+
+STAGES = ["process_season", "main", "save_to_csv", "add_city"]
+
+# main() fetches these seasons; process_season is timed on one of them
+SEASONS = range(2010, 2024)
+BENCH_SEASON = 2022
+TEAM_ID = 23
+GAMES_PER_SEASON = 82
+
+RESULTS_FILE = "bench_pipeline_results.json"
+
+
+# Function to load one of the hyphenated scripts by path
+def load_script(name, *path):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(REPO_DIR, *path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Function to read the process's peak resident set size in MB
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# Function to read the fake API's request counter
+def server_requests(base_url):
+    with urllib.request.urlopen(f"{base_url}/_stats") as response:
+        return json.load(response)["requests"]
+
+
+# Function to count data rows in the CSVs matching a pattern
+def count_csv_rows(pattern):
+    rows = 0
+    for path in glob.glob(pattern):
+        with open(path, newline="") as csvfile:
+            rows += sum(1 for _ in csv.DictReader(csvfile))
+    return rows
+
+
+def run_stage(stage, scale, base_url, rate):
+    """
+    Runs one stage inside this process and measures it. Called in a fresh
+    child process per stage so that peak RSS and the response cache start
+    clean every time.
+
+    :param stage: One of STAGES
+    :param scale: Multiplier on the games per season
+    :param base_url: Fake API address
+    :param rate: Token bucket rate for the fetch stages
+    :return: Dict of measurements
+    """
+    import fetch_engine
+    import travel_matrix
+
+    iterate = load_script("canucks_iterate", "iterative-seasons", "canucks-iterate.py")
+    fetch_engine.configure(rate=rate, burst=max(int(rate), 1))
+    fetch_engine.BACKOFF_BASE = 0.05
+
+    # The cache starts empty; build the travel lookup tables before timing so
+    # every stage measures the pipeline rather than that one-off build
+    travel_matrix.offset_table()
+    travel_matrix.distance_matrix()
+    requests_before = server_requests(base_url)
+
+    if stage == "process_season":
+        start = time.perf_counter()
+        iterate.process_season(TEAM_ID, BENCH_SEASON)
+        elapsed = time.perf_counter() - start
+        rows = count_csv_rows(f"canucks_game_history_{iterate.get_season_id(BENCH_SEASON)}.csv")
+
+    elif stage == "main":
+        start = time.perf_counter()
+        iterate.main(rate=rate)
+        elapsed = time.perf_counter() - start
+        rows = count_csv_rows("canucks_game_history_*.csv")
+
+    elif stage == "save_to_csv":
+        from fake_nhl_api import synthetic_season
+
+        # Build the season rows up front; only the writes are timed
+        seasons = {}
+        for start_year in SEASONS:
+            games = [
+                game for game in synthetic_season(start_year, GAMES_PER_SEASON * scale)
+                if TEAM_ID in (game["homeTeamId"], game["visitingTeamId"])
+            ]
+            season = iterate.get_season_id(start_year)
+            seasons[season] = iterate.process_travel(iterate.build_game_rows(games, TEAM_ID, season))
+
+        start = time.perf_counter()
+        for season, game_data in seasons.items():
+            iterate.save_to_csv(game_data, season)
+        elapsed = time.perf_counter() - start
+        rows = sum(len(game_data) for game_data in seasons.values())
+
+    elif stage == "add_city":
+        from bench_add_city import add_city, synthetic_games
+
+        rows = GAMES_PER_SEASON * len(SEASONS) * scale
+        df = synthetic_games(rows)
+        start = time.perf_counter()
+        add_city.enrich(df)
+        elapsed = time.perf_counter() - start
+
+    else:
+        raise ValueError(f"Unknown stage {stage!r}; choose one of {', '.join(STAGES)}")
+
+    return {
+        "stage": stage,
+        "scale": scale,
+        "rows": rows,
+        "seconds": elapsed,
+        "requests": server_requests(base_url) - requests_before,
+        "peak_rss_mb": peak_rss_mb(),
+        "rows_per_second": rows / elapsed if elapsed else None,
+    }
+
+
+# Function to start the fake API in its own process so its memory is not counted
+def start_server(scale, latency, error_rate, fixtures_dir=None):
+    command = [
+        sys.executable, os.path.join(BENCH_DIR, "fake_nhl_api.py"), "--port", "0",
+        "--first-season", str(SEASONS[0]), "--last-season", str(SEASONS[-1]),
+        "--games-per-team", str(GAMES_PER_SEASON * scale),
+        "--latency", str(latency), "--error-rate", str(error_rate),
+    ]
+    if fixtures_dir:
+        command += ["--fixtures", fixtures_dir]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    base_url = server.stdout.readline().strip().rsplit(" ", 1)[-1]
+    return server, base_url
+
+
+# Function to run one stage in a child process with its own cache and working directory
+def run_child(stage, scale, base_url, rate):
+    work_dir = tempfile.mkdtemp(prefix=f"canucks-bench-{stage}-")
+    result_file = os.path.join(work_dir, "result.json")
+    env = dict(
+        os.environ,
+        NHL_STATS_BASE_URL=base_url,
+        NHL_WEB_BASE_URL=base_url,
+        CANUCKS_CACHE_DIR=os.path.join(work_dir, ".cache"),
+    )
+    subprocess.run(
+        [
+            sys.executable, os.path.abspath(__file__), "--stage", stage, "--scale", str(scale),
+            "--base-url", base_url, "--rate", str(rate), "--result-file", result_file,
+        ],
+        cwd=work_dir, env=env, stdout=subprocess.DEVNULL, check=True,
+    )
+    with open(result_file) as f:
+        return json.load(f)
+
+
+def compare(results, baseline_file, tolerance):
+    """
+    Prints each measurement against the same stage and scale in a previous
+    results file.
+
+    :param results: List of measurement dicts from this run
+    :param baseline_file: Results JSON saved by an earlier run
+    :param tolerance: Allowed slowdown before a stage counts as a regression, e.g. 0.2
+    :return: List of (stage, scale) pairs that regressed
+    """
+    with open(baseline_file) as f:
+        baseline = {(row["stage"], row["scale"]): row for row in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\ncompared with {baseline_file}:")
+    for row in results:
+        previous = baseline.get((row["stage"], row["scale"]))
+        if previous is None:
+            continue
+        time_ratio = row["seconds"] / previous["seconds"] if previous["seconds"] else float("inf")
+        rss_ratio = row["peak_rss_mb"] / previous["peak_rss_mb"] if previous["peak_rss_mb"] else float("inf")
+        regressed = time_ratio > 1 + tolerance
+        if regressed:
+            regressions.append((row["stage"], row["scale"]))
+        print(
+            f"{row['stage']:>14}  x{row['scale']:<4}  time {time_ratio:6.2f}x  rss {rss_ratio:6.2f}x"
+            f"  requests {previous['requests']} -> {row['requests']}" + ("  REGRESSION" if regressed else "")
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ingestion pipeline against a local fake NHL API.")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100], help="Multipliers on games per season")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds of simulated server latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429/503")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Token bucket rate in requests per second")
+    parser.add_argument("--fixtures", help="Directory of recorded team.json/season.json/game.json responses")
+    parser.add_argument("--output", default=RESULTS_FILE, help="Where to save this run's results")
+    parser.add_argument("--compare", metavar="FILE", help="Previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging a regression")
+    # Internal: run a single stage in this process (used for the per-stage child processes)
+    parser.add_argument("--stage", help=argparse.SUPPRESS)
+    parser.add_argument("--scale", type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stage:
+        result = run_stage(args.stage, args.scale, args.base_url, args.rate)
+        with open(args.result_file, "w") as f:
+            json.dump(result, f)
+        return 0
+
+    results = []
+    print(f"{'stage':>14}  {'scale':>5}  {'rows':>9}  {'seconds':>8}  {'requests':>8}  {'peak MB':>8}  {'rows/s':>12}")
+    for scale in args.scales:
+        server, base_url = start_server(scale, args.latency, args.error_rate, args.fixtures)
+        try:
+            for stage in args.stages:
+                row = run_child(stage, scale, base_url, args.rate)
+                results.append(row)
+                print(
+                    f"{stage:>14}  {scale:>5}  {row['rows']:>9}  {row['seconds']:>8.3f}  {row['requests']:>8}"
+                    f"  {row['peak_rss_mb']:>8.1f}  {row['rows_per_second'] or 0:>12,.0f}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+    regressions = compare(results, args.compare, args.tolerance) if args.compare else []
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency": args.latency,
+            "error_rate": args.error_rate,
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
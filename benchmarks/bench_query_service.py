@@ -0,0 +1,127 @@
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(os.path.join(REPO_DIR, "common"))
+
+import game_index
+from team_mapping import nhl_team_mapping
+
+# The query service is a hyphenated script, so it is loaded by path
+spec = importlib.util.spec_from_file_location(
+    "query_service", os.path.join(REPO_DIR, "query-service", "canucks-query-service.py")
+)
+query_service = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(query_service)
+
+QUERIES = [
+    "/aggregate?location=Away&max_rest=1&conference=Eastern",
+    "/aggregate?by=opponent&from=2015-10-01&to=2019-04-15",
+    "/aggregate?by=season&location=Home",
+    "/games?opponent=Calgary%20Flames&season=2022-2023",
+    "/games?back_to_back=true&limit=20",
+]
+
+
+def write_seasons(data_dir, seasons, games_per_season, seed=0):
+    """
+    Writes synthetic per-season CSVs shaped like save_to_csv output.
+    """
+    rng = np.random.default_rng(seed)
+    opponents = np.array([name for name in nhl_team_mapping if name != "Vancouver Canucks"], dtype=object)
+    for start_year in seasons:
+        days = np.sort(rng.integers(0, 195, games_per_season))
+        rest = np.diff(days, prepend=days[0])
+        scored = rng.integers(0, 7, games_per_season)
+        conceded = rng.integers(0, 7, games_per_season)
+        pd.DataFrame({
+            "Season": f"{start_year}-{start_year + 1}",
+            "Game Location": np.where(rng.random(games_per_season) < 0.5, "Home", "Away"),
+            "Opponent Team": opponents[rng.integers(0, len(opponents), games_per_season)],
+            "Distance Traveled (miles)": rng.random(games_per_season) * 2500,
+            "Rest Days": rest,
+            "Back To Back": rest == 1,
+            "Goals Scored": scored,
+            "Goals Conceded": conceded,
+            "Result": np.where(scored > conceded, "Win", "Loss"),
+            "Game Date": (np.datetime64(f"{start_year}-10-01") + days).astype(str),
+        }).to_csv(os.path.join(data_dir, f"canucks_game_history_{start_year}-{start_year + 1}.csv"), index=False)
+
+
+# Function to time in-process queries, without HTTP
+def time_in_process(index, repeat=2000):
+    filters = {"location": "Away", "max_rest": 1, "conference": "Eastern"}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        index.aggregate(index.select(filters))
+    return (time.perf_counter() - start) / repeat
+
+
+def load_test(base_url, clients, duration):
+    """
+    Runs `clients` threads sending the QUERIES in a loop for `duration` seconds.
+
+    :return: (request latencies in seconds, server-side query times in microseconds)
+    """
+    latencies, server_times = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset):
+        i = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            with urllib.request.urlopen(base_url + QUERIES[i % len(QUERIES)]) as response:
+                body = json.load(response)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                server_times.append(body["elapsedMicroseconds"])
+            i += 1
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(client, range(clients)))
+    return np.array(latencies), np.array(server_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the local game history query service.")
+    parser.add_argument("--seasons", type=int, default=50, help="Number of season files")
+    parser.add_argument("--games", type=int, default=82, help="Games per season")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="canucks-query-bench-")
+    write_seasons(data_dir, range(2024 - args.seasons, 2024), args.games)
+
+    start = time.perf_counter()
+    index = game_index.ReloadingIndex(data_dir)
+    print(f"indexed {index.index.size} games in {time.perf_counter() - start:.3f}s")
+    print(f"in-process aggregate query: {time_in_process(index.index) * 1e6:.1f} us")
+
+    server = query_service.make_server(index, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    latencies, server_times = load_test(f"http://127.0.0.1:{server.server_port}", args.clients, args.duration)
+    server.shutdown()
+
+    print(f"{len(latencies)} requests from {args.clients} clients: {len(latencies) / args.duration:,.0f} req/s")
+    print(
+        f"latency p50 {np.percentile(latencies, 50) * 1e3:.2f} ms  p99 {np.percentile(latencies, 99) * 1e3:.2f} ms"
+        f"  (server-side query p50 {np.percentile(server_times, 50):.1f} us)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Same 32 clubs as nhl_team_mapping, with their stats API ids
+TEAMS = [
+    (24, "Anaheim Ducks"), (68, "Utah Mammoth"), (6, "Boston Bruins"), (7, "Buffalo Sabres"),
+    (20, "Calgary Flames"), (12, "Carolina Hurricanes"), (16, "Chicago Blackhawks"), (21, "Colorado Avalanche"),
+    (29, "Columbus Blue Jackets"), (25, "Dallas Stars"), (17, "Detroit Red Wings"), (22, "Edmonton Oilers"),
+    (13, "Florida Panthers"), (26, "Los Angeles Kings"), (30, "Minnesota Wild"), (8, "Montreal Canadiens"),
+    (18, "Nashville Predators"), (1, "New Jersey Devils"), (2, "New York Islanders"), (3, "New York Rangers"),
+    (9, "Ottawa Senators"), (4, "Philadelphia Flyers"), (5, "Pittsburgh Penguins"), (28, "San Jose Sharks"),
+    (55, "Seattle Kraken"), (19, "St. Louis Blues"), (14, "Tampa Bay Lightning"), (10, "Toronto Maple Leafs"),
+    (23, "Vancouver Canucks"), (54, "Vegas Golden Knights"), (15, "Washington Capitals"), (52, "Winnipeg Jets"),
+]
+
+
+def synthetic_season(start_year, games_per_team=82, seed=0):
+    """
+    Builds a deterministic fake /game list for one season: every team plays
+    games_per_team games between October 1 and mid-April.
+
+    :param start_year: First calendar year of the season
+    :param games_per_team: Games each team plays
+    :param seed: Random seed mixed with the year
+    :return: List of game dicts shaped like the stats API
+    """
+    rng = random.Random(start_year * 1000 + seed)
+    team_ids = [team_id for team_id, _ in TEAMS]
+    opening_day = date(start_year, 10, 1)
+    games = []
+
+    # Each round pairs every team once; rounds are spread over ~195 days
+    for round_number in range(games_per_team):
+        rng.shuffle(team_ids)
+        game_date = (opening_day + timedelta(days=round_number * 195 // games_per_team)).isoformat()
+        for i in range(0, len(team_ids), 2):
+            games.append({
+                "id": int(f"{start_year}02{len(games) + 1:04d}"),
+                "gameDate": game_date,
+                "gameStateId": 7,
+                "gameType": 2,
+                "homeTeamId": team_ids[i],
+                "visitingTeamId": team_ids[i + 1],
+                "homeScore": rng.randint(0, 6),
+                "visitingScore": rng.randint(0, 6),
+                "season": int(f"{start_year}{start_year + 1}"),
+            })
+    return games
+
+
+class FakeNHLApi:
+    """
+    Local stand-in for https://api.nhle.com/stats/rest/en serving /team,
+    /season, /franchise and /game with configurable latency and error injection.
+
+    Data is synthetic unless fixtures_dir holds recorded responses: team.json,
+    season.json, franchise.json and game.json, each either a raw API payload ({"data": [...]})
+    or a bare list of rows. Missing files fall back to synthetic data.
+    """
+
+    def __init__(self, first_season=1970, last_season=2024, latency=0.0, error_rate=0.0,
+                 games_per_team=82, port=0, fixtures_dir=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.lock = threading.Lock()
+        self.teams = [{"id": team_id, "fullName": name} for team_id, name in TEAMS]
+        self.games = []
+        for start_year in range(first_season, last_season + 1):
+            self.games.extend(synthetic_season(start_year, games_per_team))
+        self.seasons = [
+            {
+                "id": int(f"{year}{year + 1}"),
+                "formattedSeasonId": f"{year}-{str(year + 1)[2:]}",
+                "startDate": f"{year}-10-01T00:00:00",
+                "endDate": f"{year + 1}-06-15T00:00:00",
+                "regularSeasonEndDate": f"{year + 1}-04-15T00:00:00",
+            }
+            for year in range(first_season, last_season + 1)
+        ]
+        self.franchises = [
+            {"id": index + 1, "firstSeasonId": int(f"{first_season}{first_season + 1}"), "mostRecentTeamId": team["id"],
+             "lastSeasonId": None, "fullName": team["fullName"]}
+            for index, team in enumerate(self.teams)
+        ]
+        if fixtures_dir:
+            self.franchises = self._load_fixture(fixtures_dir, "franchise.json", self.franchises)
+            self.teams = self._load_fixture(fixtures_dir, "team.json", self.teams)
+            self.seasons = self._load_fixture(fixtures_dir, "season.json", self.seasons)
+            self.games = self._load_fixture(fixtures_dir, "game.json", self.games)
+
+        # Per-team index so single-team queries stay fast at scaled-up sizes
+        self.games_by_team = {}
+        for game in self.games:
+            self.games_by_team.setdefault(game["homeTeamId"], []).append(game)
+            self.games_by_team.setdefault(game["visitingTeamId"], []).append(game)
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+
+    @staticmethod
+    def _load_fixture(fixtures_dir, filename, default):
+        path = os.path.join(fixtures_dir, filename)
+        if not os.path.exists(path):
+            return default
+        with open(path) as f:
+            payload = json.load(f)
+        return payload.get("data", []) if isinstance(payload, dict) else payload
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def filter_games(self, expression):
+        team_ids = {int(team_id) for team_id in re.findall(r"(?:homeTeamId|visitingTeamId)=(\d+)", expression)}
+        after = re.search(r"gameDate>'([\d-]+)'", expression)
+        start = re.search(r"gameDate>='([\d-]+)'", expression)
+        end = re.search(r"gameDate<='([\d-]+)'", expression)
+        season = re.search(r"season(?:Id)?=(\d+)", expression)
+
+        games = self.games
+        if len(team_ids) == 1:
+            games = self.games_by_team.get(next(iter(team_ids)), [])
+        elif team_ids:
+            games = [g for g in games if g["homeTeamId"] in team_ids or g["visitingTeamId"] in team_ids]
+        if after:
+            games = [g for g in games if g["gameDate"] > after.group(1)]
+        if start:
+            games = [g for g in games if g["gameDate"] >= start.group(1)]
+        if end:
+            games = [g for g in games if g["gameDate"] <= end.group(1)]
+        if season:
+            games = [g for g in games if int(g.get("season", 0)) == int(season.group(1))]
+        return games
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path == "/_stats":
+                    # Lets an out-of-process client read the request counter
+                    self._send(200, {"requests": api.request_count})
+                    return
+                with api.lock:
+                    api.request_count += 1
+                if api.latency:
+                    time.sleep(api.latency)
+                if api.error_rate and random.random() < api.error_rate:
+                    self._send(random.choice([429, 503]), {"message": "injected error"})
+                    return
+
+                parts = urllib.parse.urlsplit(self.path)
+                query = dict(urllib.parse.parse_qsl(parts.query))
+                if parts.path.endswith("/team"):
+                    rows = api.teams
+                elif parts.path.endswith("/season"):
+                    rows = api.seasons
+                elif parts.path.endswith("/franchise"):
+                    rows = api.franchises
+                elif parts.path.endswith("/game"):
+                    rows = api.filter_games(query.get("cayenneExp", ""))
+                else:
+                    self._send(404, {"message": "not found"})
+                    return
+
+                total = len(rows)
+                start = int(query.get("start", 0))
+                limit = int(query.get("limit", -1))
+                rows = rows[start:] if limit < 0 else rows[start:start + limit]
+                self._send(200, {"data": rows, "total": total})
+
+            def _send(self, status, body):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a fake NHL stats API on localhost.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429/503")
+    parser.add_argument("--fixtures", help="Directory of recorded team.json/season.json/game.json responses")
+    parser.add_argument("--first-season", type=int, default=1970)
+    parser.add_argument("--last-season", type=int, default=2024)
+    parser.add_argument("--games-per-team", type=int, default=82)
+    args = parser.parse_args()
+
+    api = FakeNHLApi(
+        first_season=args.first_season,
+        last_season=args.last_season,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        games_per_team=args.games_per_team,
+        port=args.port,
+        fixtures_dir=args.fixtures,
+    )
+    print(f"Fake NHL API listening on {api.base_url}", flush=True)
+    api.server.serve_forever()
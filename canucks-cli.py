@@ -0,0 +1,65 @@
+import argparse
+import os
+import runpy
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Subcommand -> (script, arguments placed before the user's, description).
+# Scripts are only loaded once their subcommand is chosen, so `--help` and
+# quick commands never import pandas, requests or the reference data.
+COMMANDS = {
+    "fetch": (
+        os.path.join("iterative-seasons", "canucks-iterate.py"), [],
+        "Fetch game history (--season START_YEAR for one season, --update, --league, ...)",
+    ),
+    "backfill": (
+        os.path.join("iterative-seasons", "canucks-iterate.py"), ["--backfill"],
+        "Resumable backfill of every season since the franchise's first (or FIRST_YEAR)",
+    ),
+    "enrich": (
+        os.path.join("data-conversion", "add-city.py"), [],
+        "Add each game's venue city, state/province and coordinates (--stream for per-season files)",
+    ),
+    "query": (
+        os.path.join("query-service", "canucks-query-service.py"), [],
+        "Serve the per-season game history as a local JSON query API",
+    ),
+    "schedule": (
+        os.path.join("schedule", "fatigue-projection.py"), [],
+        "Project travel and rest over the remaining schedule",
+    ),
+    "analytics": (
+        os.path.join("analytics", "canucks-analytics.py"), [],
+        "Win rate by rest, time zone shift, road trip length and opponent",
+    ),
+    "players": (
+        os.path.join("player-stats", "player-stats.py"), [],
+        "Player season stats warehouse (load, career, leaders)",
+    ),
+}
+
+
+# Function to run a script as if it had been started directly with these arguments
+def run_script(script, args):
+    path = os.path.join(REPO_DIR, script)
+    sys.argv = [path] + args
+    runpy.run_path(path, run_name="__main__")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Canucks statistics toolkit. Run '<command> --help' for the options of each command.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n" + "\n".join(f"  {name:<10} {info[2]}" for name, info in COMMANDS.items()),
+    )
+    parser.add_argument("command", choices=COMMANDS, metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    script, prefix, _ = COMMANDS[args.command]
+    run_script(script, prefix + args.args)
+
+
+if __name__ == "__main__":
+    main()
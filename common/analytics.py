@@ -0,0 +1,144 @@
+import glob
+import hashlib
+import os
+
+from lazy import lazy_import
+
+# Loaded on first use, so listing the cube names does not import pandas
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Per-season CSVs written by save_to_csv
+CSV_PATTERN = "canucks_game_history_*.csv"
+CUBE_FILE = "canucks_analytics_cubes.pkl"
+
+REST_BUCKETS = [float("-inf"), 0, 1, 2, float("inf")]
+REST_LABELS = ["0 (opener)", "1 (back-to-back)", "2", "3+"]
+
+CUBE_NAMES = ["rest_days", "time_zone_shift", "road_trip_length", "opponent_season"]
+
+_memo = {}
+
+
+# Function to fingerprint the input files so cubes are rebuilt when games are added
+def source_fingerprint(paths):
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_games(paths):
+    """
+    Reads the per-season CSVs into one frame with only the columns the cubes use.
+
+    :param paths: List of CSV paths
+    :return: DataFrame
+    """
+    columns = [
+        "Season", "Game Location", "Opponent Team", "Time Zone Change", "Rest Days",
+        "Road Trip Game", "Result", "Game Date",
+    ]
+    frames = [pd.read_csv(path, usecols=lambda column: column in columns) for path in sorted(paths)]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    games = pd.concat(frames, ignore_index=True)
+    games["Win"] = (games["Result"] == "Win").astype(np.int64)
+    return games.sort_values(["Season", "Game Date"], kind="stable").reset_index(drop=True)
+
+
+# Function to aggregate games/wins/win rate over one or more keys
+def _win_rate(games, keys):
+    cube = games.groupby(keys, observed=True)["Win"].agg(Games="size", Wins="sum").reset_index()
+    cube["Win Rate"] = cube["Wins"] / cube["Games"]
+    return cube
+
+
+def build_cubes(games):
+    """
+    Materializes every aggregate cube from the game rows.
+
+    :param games: DataFrame from load_games
+    :return: Dict of cube name -> DataFrame
+    """
+    games = games.copy()
+    games["Rest Bucket"] = pd.cut(games["Rest Days"].fillna(0), REST_BUCKETS, labels=REST_LABELS)
+    games["Time Zone Shift"] = games["Time Zone Change"].fillna(0).round().astype(np.int64)
+
+    # Road trip length: number of away games in the trip each away game belongs to
+    away = games[games["Game Location"] == "Away"].copy()
+    if "Road Trip Game" in away.columns and not away.empty:
+        trip_start = (away["Road Trip Game"] == 1) | away["Season"].ne(away["Season"].shift())
+        away["Trip"] = trip_start.cumsum()
+        away["Road Trip Length"] = away.groupby("Trip")["Road Trip Game"].transform("max")
+        road_trips = _win_rate(away, ["Road Trip Length"])
+    else:
+        road_trips = pd.DataFrame(columns=["Road Trip Length", "Games", "Wins", "Win Rate"])
+
+    return {
+        "rest_days": _win_rate(games, ["Rest Bucket"]),
+        "time_zone_shift": _win_rate(games, ["Time Zone Shift"]),
+        "road_trip_length": road_trips,
+        "opponent_season": _win_rate(games, ["Opponent Team", "Season"]),
+    }
+
+
+def get_cubes(data_dir=".", cube_file=None):
+    """
+    Returns the aggregate cubes, rebuilding them only when the per-season
+    CSVs have changed since they were last materialized. Cubes are kept in
+    memory for the process and pickled next to the data between runs.
+
+    :param data_dir: Directory holding the per-season CSVs
+    :param cube_file: Where the materialized cubes are stored
+    :return: Dict of cube name -> DataFrame
+    """
+    paths = glob.glob(os.path.join(data_dir, CSV_PATTERN))
+    fingerprint = source_fingerprint(paths)
+    cube_file = cube_file or os.path.join(data_dir, CUBE_FILE)
+
+    cached = _memo.get(cube_file)
+    if cached and cached["fingerprint"] == fingerprint:
+        return cached["cubes"]
+
+    stored = None
+    if os.path.exists(cube_file):
+        try:
+            stored = pd.read_pickle(cube_file)
+        except Exception:
+            stored = None
+
+    if stored and stored.get("fingerprint") == fingerprint:
+        cubes = stored["cubes"]
+    else:
+        cubes = build_cubes(load_games(paths))
+        tmp_file = f"{cube_file}.tmp"
+        pd.to_pickle({"fingerprint": fingerprint, "cubes": cubes}, tmp_file)
+        os.replace(tmp_file, cube_file)
+
+    _memo[cube_file] = {"fingerprint": fingerprint, "cubes": cubes}
+    return cubes
+
+
+def query(cube_name, data_dir=".", filters=None):
+    """
+    Answers a question from a materialized cube, e.g.
+    query("opponent_season", filters={"Opponent Team": "Calgary Flames"}).
+
+    :param cube_name: One of CUBE_NAMES
+    :param data_dir: Directory holding the per-season CSVs
+    :param filters: Dict of column -> value (or list of values)
+    :return: Filtered DataFrame
+    """
+    if cube_name not in CUBE_NAMES:
+        raise ValueError(f"Unknown cube {cube_name!r}; choose one of {', '.join(CUBE_NAMES)}")
+
+    cube = get_cubes(data_dir)[cube_name]
+    for column, value in (filters or {}).items():
+        if column not in cube.columns:
+            raise ValueError(f"Cube {cube_name!r} has no column {column!r}; choose one of {', '.join(cube.columns)}")
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        # Compare as strings so command-line filters match numeric keys too
+        cube = cube[cube[column].astype(str).isin([str(v) for v in values])]
+    return cube
@@ -0,0 +1,137 @@
+import fetch_engine
+import http_cache
+
+WEB_BASE_URL = http_cache.WEB_BASE_URL
+
+# gameState values of a game whose boxscore can no longer change
+FINAL_STATES = {"FINAL", "OFF"}
+
+# Live and upcoming games are revalidated (ETag/If-Modified-Since) after a minute
+LIVE_GAME_TTL = 60
+
+# Per-team boxscore totals -> the stat keys summed over that team's players
+BOX_STATS = {
+    "PIM": ("pim",),
+    "Hits": ("hits",),
+    "Blocked Shots": ("blockedShots",),
+    "Power Play Goals": ("powerPlayGoals",),
+}
+BOX_COLUMNS = [
+    f"{stat} {side}"
+    for stat in ["Shots On Goal", "Goalie Saves"] + list(BOX_STATS)
+    for side in ("For", "Against")
+]
+
+
+def fetch_game_detail(game_id, game_date=None, endpoint="boxscore"):
+    """
+    Fetches one game's gamecenter boxscore (or landing) payload.
+
+    Games dated before today are cached permanently, provided the payload
+    says the game is final. Anything else is stored for LIVE_GAME_TTL and
+    then revalidated with a conditional request, which costs a 304 rather
+    than the full payload while nothing has changed. A game that goes final
+    today is pinned as soon as its final payload is seen.
+
+    :param game_id: NHL game ID
+    :param game_date: Game date in "YYYY-MM-DD" format, if known
+    :param endpoint: "boxscore" or "landing"
+    :return: Parsed JSON payload, or None on error
+    """
+    url = f"{WEB_BASE_URL}/gamecenter/{game_id}/{endpoint}"
+    finished = http_cache.game_finished(game_date)
+    response = fetch_engine.get(url, ttl=None if finished else LIVE_GAME_TTL)
+    if response.status_code != 200:
+        print(f"Error fetching {endpoint} for game {game_id}")
+        return None
+
+    payload = response.json()
+    final = payload.get("gameState") in FINAL_STATES
+    if finished and not final:
+        # Postponed or under review: do not keep this version forever
+        http_cache.set_ttl(url, 0)
+    elif final and not finished and not response.from_cache:
+        http_cache.set_ttl(url, None)
+    return payload
+
+
+# Function to sum some stat keys over a list of player rows
+def _sum(players, keys):
+    return sum(int(player.get(key) or 0) for player in players for key in keys)
+
+
+# Function to read a goalie's saves, from "saves" or the "saves/shots" string
+def _saves(goalie):
+    if goalie.get("saves") is not None:
+        return int(goalie["saves"])
+    saves, _, _ = str(goalie.get("saveShotsAgainst") or "0/0").partition("/")
+    return int(saves or 0)
+
+
+def team_totals(payload):
+    """
+    Extracts per-team totals from a boxscore payload.
+
+    :param payload: Boxscore JSON
+    :return: Dict of team ID -> {"Shots On Goal", "Goalie Saves", "PIM", ...}
+    """
+    totals = {}
+    players = payload.get("playerByGameStats") or {}
+    for side in ("homeTeam", "awayTeam"):
+        team = payload.get(side) or {}
+        side_players = players.get(side) or {}
+        skaters = (side_players.get("forwards") or []) + (side_players.get("defense") or [])
+        goalies = side_players.get("goalies") or []
+
+        values = {
+            "Shots On Goal": team["sog"] if team.get("sog") is not None else _sum(skaters, ("sog",)),
+            "Goalie Saves": sum(_saves(goalie) for goalie in goalies),
+        }
+        for stat, keys in BOX_STATS.items():
+            values[stat] = _sum(skaters + goalies if stat == "PIM" else skaters, keys)
+        totals[team.get("id")] = values
+    return totals
+
+
+def fetch_season_details(game_data, endpoint="boxscore"):
+    """
+    Bulk-fetches the boxscore of every game in game_data. Final games already
+    in the cache cost nothing, so re-running over a full backfill only fetches
+    games that are new or still live.
+
+    :param game_data: Season rows with "Game ID" and "Game Date"
+    :param endpoint: "boxscore" or "landing"
+    :return: Dict of game ID -> payload
+    """
+    keys = [
+        (int(game["Game ID"]), game["Game Date"])
+        for game in game_data
+        if game.get("Game ID") not in (None, "")
+    ]
+    payloads = fetch_engine.run_concurrently(lambda key: fetch_game_detail(key[0], key[1], endpoint), keys)
+    return {game_id: payload for (game_id, _), payload in zip(keys, payloads) if payload is not None}
+
+
+def join_details(game_data, payloads, team_id):
+    """
+    Adds BOX_COLUMNS to the season rows from the point of view of team_id.
+
+    :param game_data: Season rows (GameRecords or dicts) with "Game ID"
+    :param payloads: Dict of game ID -> boxscore payload
+    :param team_id: Stats API ID of the team the rows belong to
+    :return: The same rows, with BOX_COLUMNS filled where a boxscore was found
+    """
+    for game in game_data:
+        game_id = game.get("Game ID")
+        payload = payloads.get(int(game_id)) if game_id not in (None, "") else None
+        if payload is None:
+            continue
+        totals = team_totals(payload)
+        own = totals.get(team_id)
+        other = next((values for key, values in totals.items() if key != team_id), None)
+        if own is None or other is None:
+            continue
+        for stat in own:
+            game[f"{stat} For"] = own[stat]
+            game[f"{stat} Against"] = other[stat]
+    return game_data
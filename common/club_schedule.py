@@ -0,0 +1,134 @@
+from datetime import date
+
+import pandas as pd
+
+import fetch_engine
+import http_cache
+import team_directory
+import travel
+from team_mapping import nhl_venue_mapping
+
+WEB_BASE_URL = http_cache.WEB_BASE_URL
+
+# Schedules change rarely; after this long a re-run revalidates with a
+# conditional request, which is a cheap 304 until the schedule changes
+SCHEDULE_TTL = 60 * 60
+
+# Regular season and playoffs; preseason games are left out
+GAME_TYPES = {2, 3}
+
+SCHEDULE_COLUMNS = ["Team", "Season", "Game Location", "Opponent Team", "Game Date", "Game ID", "Game State"]
+
+
+# Function to work out the season ID (e.g. 20242025) in progress on a date
+def current_season_id(today=None):
+    today = today or date.today()
+    start_year = today.year if today.month >= 7 else today.year - 1
+    return int(f"{start_year}{start_year + 1}")
+
+
+def fetch_schedule(tri_code, season_id):
+    """
+    Fetches a club's full season schedule from club-schedule-season.
+
+    :param tri_code: Three-letter team code, e.g. "VAN"
+    :param season_id: Season in YYYYYYYY form, e.g. 20242025
+    :return: List of game dicts, or [] on error
+    """
+    response = fetch_engine.get(f"{WEB_BASE_URL}/club-schedule-season/{tri_code}/{season_id}", ttl=SCHEDULE_TTL)
+    if response.status_code != 200:
+        print(f"Error fetching the {season_id} schedule for {tri_code}")
+        return []
+    return response.json().get("games", [])
+
+
+def schedule_rows(games, team_id, season_id):
+    """
+    Turns a club schedule into one row per game from that club's point of view.
+
+    :param games: List from fetch_schedule
+    :param team_id: ID of the club the schedule belongs to
+    :param season_id: Season in YYYYYYYY form
+    :return: DataFrame with SCHEDULE_COLUMNS
+    """
+    season = f"{str(season_id)[:4]}-{str(season_id)[4:]}"
+    rows = []
+    for game in games:
+        if game.get("gameType") not in GAME_TYPES or not game.get("gameDate"):
+            continue
+        home_id = (game.get("homeTeam") or {}).get("id")
+        away_id = (game.get("awayTeam") or {}).get("id")
+        is_home = home_id == team_id
+        rows.append((
+            team_directory.get_team_name(team_id),
+            season,
+            "Home" if is_home else "Away",
+            team_directory.get_team_name(away_id if is_home else home_id),
+            str(game.get("gameDate", ""))[:10],
+            game.get("id"),
+            game.get("gameState"),
+        ))
+    return pd.DataFrame(rows, columns=SCHEDULE_COLUMNS)
+
+
+def project_fatigue(schedules, from_date=None):
+    """
+    Travel legs, time zone shifts, rest days, back-to-backs and road trip
+    totals for every game on or after from_date.
+
+    The whole schedule goes through travel.compute_travel in one vectorized
+    pass, played games included, so the first remaining game's leg starts
+    from wherever the team actually last played.
+
+    :param schedules: DataFrame of schedule_rows for one or more teams
+    :param from_date: First date to project, defaulting to today
+    :return: DataFrame of remaining games with travel.TRAVEL_COLUMNS
+    """
+    if schedules.empty:
+        return schedules
+    projected = travel.compute_travel(schedules)
+    from_date = str(from_date or date.today().isoformat())
+    remaining = projected[projected["Game Date"].astype(str).str[:10] >= from_date]
+    return remaining.reset_index(drop=True)
+
+
+def project_teams(team_names, season_id=None, from_date=None):
+    """
+    Fetches the schedules of several teams concurrently and projects their
+    remaining games together.
+
+    :param team_names: Full team names, e.g. from seasons.active_teams()
+    :param season_id: Season in YYYYYYYY form, defaulting to the current one
+    :param from_date: First date to project, defaulting to today
+    :return: DataFrame of remaining games for every team
+    """
+    season_id = season_id or current_season_id()
+    teams = {team["fullName"]: team for team in team_directory.load_teams() or []}
+    selected = [teams[name] for name in team_names if name in teams and teams[name].get("triCode")]
+    missing = sorted(set(team_names) - {team["fullName"] for team in selected})
+    if missing:
+        print(f"No team code found for: {', '.join(missing)}")
+    unmapped = sorted(team["fullName"] for team in selected if team["fullName"] not in nhl_venue_mapping)
+    if unmapped:
+        print(f"No arena known for: {', '.join(unmapped)}; their travel legs are left blank (NaN)")
+
+    schedules = fetch_engine.run_concurrently(
+        lambda team: schedule_rows(fetch_schedule(team["triCode"], season_id), team["id"], season_id), selected
+    )
+    frames = [frame for frame in schedules if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=SCHEDULE_COLUMNS + travel.TRAVEL_COLUMNS)
+    return project_fatigue(pd.concat(frames, ignore_index=True), from_date)
+
+
+# Function to summarize each team's remaining travel load; a team with a leg
+# to or from an unknown arena gets NaN totals rather than an undercount
+def fatigue_summary(projection):
+    summary = projection.groupby("Team").agg(
+        Games=("Game Date", "size"),
+        Miles=("Distance Traveled (miles)", lambda miles: miles.sum(skipna=False)),
+        Back_To_Backs=("Back To Back", "sum"),
+        Time_Zones_Crossed=("Time Zone Change", lambda changes: changes.abs().sum(skipna=False)),
+        Longest_Road_Trip=("Road Trip Game", "max"),
+    )
+    return summary.rename(columns=lambda column: column.replace("_", " ")).sort_values("Miles", ascending=False)
@@ -0,0 +1,156 @@
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import http_cache
+import tracing
+
+# Polite defaults for api.nhle.com: a couple of requests per second, small bursts
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 4
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills `rate` tokens per second up to
+    `capacity`, and acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class PooledSession:
+    """
+    Keep-alive requests.Session sized for `concurrency` connections, created
+    on the first request that actually goes to the network. Cache hits and
+    offline runs therefore never import requests.
+    """
+
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+        self.session = None
+        self.lock = threading.Lock()
+
+    def get(self, *args, **kwargs):
+        if self.session is None:
+            with self.lock:
+                if self.session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency, max_retries=0)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self.session = session
+        return self.session.get(*args, **kwargs)
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+
+# Function to tell whether an exception was raised by requests; if requests
+# was never imported, no request was sent and it cannot have been
+def _is_request_error(error):
+    requests = sys.modules.get("requests")
+    return requests is not None and isinstance(error, requests.RequestException)
+
+
+_session = None
+_limiter = None
+_concurrency = DEFAULT_CONCURRENCY
+
+
+def configure(concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+    """
+    Sets up the shared keep-alive session and rate limiter used by get().
+
+    :param concurrency: Maximum number of requests in flight
+    :param rate: Sustained requests per second sent to the API
+    :param burst: Number of requests allowed back to back before throttling
+    """
+    global _session, _limiter, _concurrency
+
+    if _session is not None:
+        _session.close()
+
+    _session = PooledSession(concurrency)
+    _limiter = TokenBucket(rate, burst)
+    _concurrency = concurrency
+
+
+# Function to compute a "full jitter" exponential backoff delay
+def backoff_delay(attempt):
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def get(url, params=None, ttl=None, max_retries=MAX_RETRIES):
+    """
+    Cached GET over the pooled session, rate limited and retried with
+    jittered backoff on 429 and 5xx responses.
+
+    :param url: Request URL
+    :param params: Query parameters as a dict
+    :param ttl: Cache TTL passed through to http_cache.get
+    :param max_retries: Retries after the first attempt
+    :return: CachedResponse from the last attempt
+    """
+    if _session is None:
+        configure()
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = http_cache.get(url, params=params, ttl=ttl, session=_session, limiter=_limiter)
+        except Exception as e:
+            if not _is_request_error(e):
+                raise
+            if attempt == max_retries:
+                return http_cache.CachedResponse(599, str(e))
+        else:
+            if response.status_code not in RETRY_STATUSES or http_cache.OFFLINE:
+                return response
+            if attempt == max_retries:
+                return response
+        tracing.count("http.retries")
+        with tracing.stage("http.backoff"):
+            time.sleep(backoff_delay(attempt))
+
+
+def run_concurrently(fn, items, concurrency=None):
+    """
+    Calls fn(item) for every item on a thread pool and returns the results
+    in input order.
+
+    :param fn: Function taking a single item
+    :param items: Iterable of items, e.g. season start years
+    :param concurrency: Worker count, defaulting to the configured concurrency
+    :return: List of results
+    """
+    with ThreadPoolExecutor(max_workers=concurrency or _concurrency) as pool:
+        return list(pool.map(fn, items))
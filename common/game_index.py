@@ -0,0 +1,228 @@
+import glob
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import analytics
+from team_mapping import nhl_conferences
+
+# Filters that select rows by exact value, and the CSV column each one reads
+VALUE_FILTERS = {
+    "season": "Season",
+    "opponent": "Opponent Team",
+    "location": "Game Location",
+    "conference": "Conference",
+    "result": "Result",
+}
+GROUP_KEYS = list(VALUE_FILTERS)
+
+CONFERENCE_BY_TEAM = {team: conference for conference, teams in nhl_conferences.items() for team in teams}
+
+
+# Function to turn a frame value into something json.dumps accepts
+def _native(value):
+    if isinstance(value, (np.generic,)):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+class GameIndex:
+    """
+    The whole game history held in memory as NumPy columns.
+
+    Every value of season, opponent, conference, home/away and result has a
+    precomputed boolean mask, and rows are sorted by date so a date range is
+    two binary searches. A query is a handful of vectorized ANDs over a few
+    thousand booleans, well under a millisecond.
+    """
+
+    def __init__(self, games):
+        games = games.copy()
+        games["Game Date"] = pd.to_datetime(games["Game Date"].astype(str).str[:10], format="%Y-%m-%d")
+        games["Conference"] = games["Opponent Team"].map(CONFERENCE_BY_TEAM).fillna("Unknown")
+        games = games.sort_values("Game Date", kind="stable").reset_index(drop=True)
+
+        self.size = len(games)
+        self.days = games["Game Date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+        self.rest_days = _numeric(games, "Rest Days")
+        self.back_to_back = _numeric(games, "Back To Back") == 1
+        self.wins = (games["Result"] == "Win").to_numpy()
+        self.goals_for = np.nan_to_num(_numeric(games, "Goals Scored"))
+        self.goals_against = np.nan_to_num(_numeric(games, "Goals Conceded"))
+        self.distance = _numeric(games, "Distance Traveled (miles)")
+
+        # Per-value masks for filtering, and integer codes for grouping
+        self.masks = {}
+        self.codes = {}
+        for key, column in VALUE_FILTERS.items():
+            codes, labels = pd.factorize(games[column].astype(str), sort=True)
+            self.codes[key] = (codes, list(labels))
+            self.masks[key] = {label: codes == code for code, label in enumerate(labels)}
+
+        games["Game Date"] = games["Game Date"].dt.strftime("%Y-%m-%d")
+        self.records = [
+            {column: _native(value) for column, value in row.items()}
+            for row in games.to_dict("records")
+        ]
+        self.seasons = self.codes["season"][1]
+
+    def select(self, filters=None):
+        """
+        Rows matching every filter.
+
+        :param filters: Dict with any of the VALUE_FILTERS keys (a value or a
+            list of values, OR-ed together), "from"/"to" dates ("YYYY-MM-DD",
+            inclusive), "min_rest"/"max_rest" and "back_to_back" (bool)
+        :return: Boolean mask over the rows
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for key, value in (filters or {}).items():
+            if value is None or value == []:
+                continue
+            if key in VALUE_FILTERS:
+                values = value if isinstance(value, (list, tuple, set)) else [value]
+                value_masks = [self.masks[key].get(str(v)) for v in values]
+                value_masks = [m for m in value_masks if m is not None]
+                mask &= np.logical_or.reduce(value_masks) if value_masks else False
+            elif key == "from":
+                mask[:np.searchsorted(self.days, _day(value), side="left")] = False
+            elif key == "to":
+                mask[np.searchsorted(self.days, _day(value), side="right"):] = False
+            elif key == "min_rest":
+                mask &= self.rest_days >= float(value)
+            elif key == "max_rest":
+                mask &= self.rest_days <= float(value)
+            elif key == "back_to_back":
+                mask &= self.back_to_back if value else ~self.back_to_back
+            else:
+                raise ValueError(f"Unknown filter {key!r}")
+        return mask
+
+    # Function to return the matching rows as JSON-ready dicts
+    def rows(self, mask, limit=None):
+        positions = np.flatnonzero(mask)
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.records[position] for position in positions.tolist()]
+
+    def aggregate(self, mask, by=None):
+        """
+        Games, wins, win rate, goals per game and average travel over the
+        matching rows, either overall or grouped by one of GROUP_KEYS.
+
+        :param mask: Boolean mask from select()
+        :param by: Optional group key, e.g. "opponent"
+        :return: Dict, or a list of dicts (one per group) when by is given
+        """
+        if by is None:
+            return _summary(
+                int(mask.sum()), int(self.wins[mask].sum()), float(self.goals_for[mask].sum()),
+                float(self.goals_against[mask].sum()), self.distance[mask],
+            )
+        if by not in GROUP_KEYS:
+            raise ValueError(f"Unknown group {by!r}; choose one of {', '.join(GROUP_KEYS)}")
+
+        codes, labels = self.codes[by]
+        selected = codes[mask]
+        size = len(labels)
+        games = np.bincount(selected, minlength=size)
+        wins = np.bincount(selected, weights=self.wins[mask], minlength=size)
+        goals_for = np.bincount(selected, weights=self.goals_for[mask], minlength=size)
+        goals_against = np.bincount(selected, weights=self.goals_against[mask], minlength=size)
+        distance = self.distance[mask]
+        return [
+            dict({by: labels[code]}, **_summary(
+                int(games[code]), int(wins[code]), float(goals_for[code]), float(goals_against[code]),
+                distance[selected == code],
+            ))
+            for code in np.flatnonzero(games).tolist()
+        ]
+
+
+# Function to read a column as floats (booleans as 0/1), or all NaN if it is missing
+def _numeric(games, column):
+    if column not in games:
+        return np.full(len(games), np.nan)
+    values = games[column]
+    if values.dtype == object:
+        values = values.replace({"True": 1, "False": 0})
+    return pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+
+
+# Function to turn "YYYY-MM-DD" into a day number comparable with GameIndex.days
+def _day(value):
+    return np.datetime64(str(value)[:10], "D").astype(np.int64)
+
+
+def _summary(games, wins, goals_for, goals_against, distance):
+    distance = distance[~np.isnan(distance)]
+    return {
+        "games": games,
+        "wins": wins,
+        "losses": games - wins,
+        "win_rate": wins / games if games else None,
+        "goals_for_per_game": goals_for / games if games else None,
+        "goals_against_per_game": goals_against / games if games else None,
+        "avg_distance_miles": float(distance.mean()) if len(distance) else None,
+    }
+
+
+def load_index(data_dir="."):
+    """
+    Builds a GameIndex from every per-season CSV in data_dir.
+
+    :param data_dir: Directory holding canucks_game_history_*.csv
+    :return: (GameIndex, fingerprint of the files it was built from)
+    """
+    paths = sorted(glob.glob(os.path.join(data_dir, analytics.CSV_PATTERN)))
+    fingerprint = analytics.source_fingerprint(paths)
+    frames = [pd.read_csv(path) for path in paths]
+    games = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=["Season", "Game Location", "Opponent Team", "Result", "Game Date", "Goals Scored", "Goals Conceded"]
+    )
+    return GameIndex(games), fingerprint
+
+
+class ReloadingIndex:
+    """
+    Holds the current GameIndex and swaps in a new one when the season CSVs
+    change. A background thread polls the files' sizes and mtimes; queries
+    never wait on a reload because the swap is a single reference assignment.
+    """
+
+    def __init__(self, data_dir=".", interval=2.0):
+        self.data_dir = data_dir
+        self.interval = interval
+        self.index, self.fingerprint = load_index(data_dir)
+        self.loaded_at = datetime.now().isoformat(timespec="seconds")
+        self._stop = threading.Event()
+
+    # Function to rebuild the index if any season file was added or changed
+    def reload_if_changed(self):
+        paths = glob.glob(os.path.join(self.data_dir, analytics.CSV_PATTERN))
+        if analytics.source_fingerprint(paths) == self.fingerprint:
+            return False
+        index, fingerprint = load_index(self.data_dir)
+        self.index, self.fingerprint = index, fingerprint
+        self.loaded_at = datetime.now().isoformat(timespec="seconds")
+        print(f"Reloaded {index.size} games from {len(paths)} season files.")
+        return True
+
+    def start(self):
+        def poll():
+            while not self._stop.wait(self.interval):
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    # A file caught mid-write is picked up on the next poll
+                    print(f"Reload failed, keeping the previous index: {e}")
+        threading.Thread(target=poll, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
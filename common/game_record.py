@@ -0,0 +1,198 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# CSV column -> GameRecord attribute, in the order save_to_csv writes them
+COLUMN_ATTRIBUTES = {
+    "Season": "season",
+    "Game Location": "game_location",
+    "Opponent Team": "opponent_team",
+    "Distance Traveled (miles)": "distance",
+    "Time Zone Change": "time_zone_change",
+    "Rest Days": "rest_days",
+    "Back To Back": "back_to_back",
+    "Road Trip Game": "road_trip_game",
+    "Road Trip Miles": "road_trip_miles",
+    "Goals Scored": "goals_scored",
+    "Goals Conceded": "goals_conceded",
+    "Result": "result",
+    "Game Date": "game_date",
+    "City": "city",
+    "Game ID": "game_id",
+}
+CSV_COLUMNS = list(COLUMN_ATTRIBUTES)
+ATTRIBUTE_COLUMNS = {attribute: column for column, attribute in COLUMN_ATTRIBUTES.items()}
+_DATE_POSITION = CSV_COLUMNS.index("Game Date")
+
+TRAVEL_ATTRIBUTES = ["distance", "time_zone_change", "rest_days", "back_to_back", "road_trip_game", "road_trip_miles"]
+
+
+# Function to parse "YYYY-MM-DD" (optionally followed by a time) into a date
+def parse_date(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class GameRecord:
+    """
+    One game from a team's point of view.
+
+    Slotted, so a record costs a fraction of the equivalent dict, with the
+    date parsed once into a datetime.date. Records can still be read and
+    written by CSV column name (record["Game ID"], record.get("Shots For")),
+    so code written against the per-game row dicts keeps working; columns
+    without an attribute, such as the play-by-play counts, go in `extra`.
+    """
+
+    __slots__ = [
+        "season", "game_location", "opponent_team", "city", "goals_scored", "goals_conceded",
+        "result", "game_date", "game_id", "extra",
+    ] + TRAVEL_ATTRIBUTES
+
+    def __init__(self, season, game_location, opponent_team, city, goals_scored, goals_conceded,
+                 result, game_date, game_id=None):
+        self.season = season
+        self.game_location = game_location
+        self.opponent_team = opponent_team
+        self.city = city
+        self.goals_scored = goals_scored
+        self.goals_conceded = goals_conceded
+        self.result = result
+        self.game_date = parse_date(game_date)
+        self.game_id = game_id
+        self.extra = None
+        for attribute in TRAVEL_ATTRIBUTES:
+            setattr(self, attribute, None)
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Rebuilds a record from a row read back from a season CSV. Travel
+        columns are left empty because they depend on the neighbouring games.
+
+        :param row: Dict of column name -> string value
+        :return: GameRecord
+        """
+        record = cls(
+            row["Season"],
+            row["Game Location"],
+            row["Opponent Team"],
+            row.get("City"),
+            _to_int(row.get("Goals Scored")),
+            _to_int(row.get("Goals Conceded")),
+            row.get("Result"),
+            row["Game Date"],
+            _to_int(row.get("Game ID")),
+        )
+        for column, value in row.items():
+            if column not in COLUMN_ATTRIBUTES and value not in (None, ""):
+                record[column] = _to_int(value)
+        return record
+
+    @property
+    def is_home(self):
+        return self.game_location == "Home"
+
+    def __getitem__(self, column):
+        attribute = COLUMN_ATTRIBUTES.get(column)
+        if attribute is None:
+            if self.extra is None or column not in self.extra:
+                raise KeyError(column)
+            return self.extra[column]
+        if attribute == "game_date":
+            return self.game_date.isoformat()
+        return getattr(self, attribute)
+
+    def __setitem__(self, column, value):
+        attribute = COLUMN_ATTRIBUTES.get(column)
+        if attribute is None:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[column] = value
+        else:
+            setattr(self, attribute, parse_date(value) if attribute == "game_date" else value)
+
+    def __contains__(self, column):
+        return column in COLUMN_ATTRIBUTES or (self.extra is not None and column in self.extra)
+
+    def get(self, column, default=None):
+        try:
+            return self[column]
+        except KeyError:
+            return default
+
+    def csv_row(self, extra_columns=()):
+        """
+        The record's values in CSV_COLUMNS order, followed by extra_columns.
+        """
+        values = [getattr(self, attribute) for attribute in COLUMN_ATTRIBUTES.values()]
+        values[_DATE_POSITION] = self.game_date.isoformat()
+        extra = self.extra or {}
+        return values + [extra.get(column) for column in extra_columns]
+
+    def __repr__(self):
+        return (f"GameRecord({self.season!r}, {self.game_location!r}, {self.opponent_team!r}, "
+                f"{self.game_date.isoformat()!r}, game_id={self.game_id!r})")
+
+
+# Function to turn a CSV string into an int, keeping blanks as None
+def _to_int(value):
+    if value is None or value == "":
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return value
+
+
+# Function to sort records by game date (a plain key sort, nothing is re-parsed)
+def sort_records(records):
+    return sorted(records, key=lambda record: record.game_date)
+
+
+def to_frame(records):
+    """
+    Builds a DataFrame straight from the records' attributes, one column at
+    a time, with "Game Date" as datetime64.
+
+    :param records: List of GameRecord
+    :return: DataFrame with CSV_COLUMNS plus any extra columns
+    """
+    columns = {}
+    for column, attribute in COLUMN_ATTRIBUTES.items():
+        if attribute == "game_date":
+            columns[column] = np.array([record.game_date for record in records], dtype="datetime64[D]")
+        else:
+            columns[column] = [getattr(record, attribute) for record in records]
+
+    extra_columns = []
+    for record in records:
+        for column in record.extra or ():
+            if column not in extra_columns:
+                extra_columns.append(column)
+    for column in extra_columns:
+        columns[column] = [(record.extra or {}).get(column) for record in records]
+    return pd.DataFrame(columns)
+
+
+def apply_travel(records, frame):
+    """
+    Copies the travel columns computed on a frame back onto the records.
+
+    :param records: List of GameRecord the frame was built from
+    :param frame: DataFrame with a "_position" column holding each row's
+        index into records, plus travel.TRAVEL_COLUMNS
+    :return: The records, in the frame's row order
+    """
+    positions = frame["_position"].to_numpy()
+    values = [frame[ATTRIBUTE_COLUMNS[attribute]].tolist() for attribute in TRAVEL_ATTRIBUTES]
+
+    ordered = []
+    for row, position in enumerate(positions):
+        record = records[position]
+        for attribute, column_values in zip(TRAVEL_ATTRIBUTES, values):
+            setattr(record, attribute, column_values[row])
+        ordered.append(record)
+    return ordered
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+from datetime import date
+
+import tracing
+from settings import BASE_URL, CACHE_DIR, WEB_BASE_URL
+
+CACHE_DB = os.path.join(CACHE_DIR, "http_cache.sqlite3")
+
+# TTL used for queries whose date window is still in progress
+CURRENT_SEASON_TTL = 15 * 60
+
+# Serve only from the cache and never touch the network
+OFFLINE = os.environ.get("CANUCKS_OFFLINE", "") not in ("", "0")
+
+# Counters so callers can check how many requests actually hit the network
+# ("revalidated" counts 304 answers to conditional requests)
+stats = {"hits": 0, "misses": 0, "network": 0, "revalidated": 0}
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for requests.Response so callers can keep checking
+    status_code and calling json() whether or not the body came from disk.
+    """
+
+    def __init__(self, status_code, text, from_cache=False):
+        self.status_code = status_code
+        self.text = text
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.text)
+
+
+# Function to bump one of the shared counters
+def _count(name):
+    with _stats_lock:
+        stats[name] += 1
+
+
+# Function to open (once per thread) the SQLite cache database
+def _connection():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(CACHE_DB, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " body TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " expires_at REAL,"
+            " etag TEXT,"
+            " last_modified TEXT)"
+        )
+        # Caches created before conditional requests lack the validator columns
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(responses)")}
+        for column in ("etag", "last_modified"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+        conn.commit()
+        _local.conn = conn
+    return conn
+
+
+# Function to switch offline mode on or off
+def set_offline(offline=True):
+    global OFFLINE
+    OFFLINE = offline
+
+
+def canonical_url(url, params=None):
+    """
+    Normalizes a URL plus query parameters so equivalent requests share a key.
+
+    :param url: Request URL, optionally already carrying a query string
+    :param params: Extra query parameters as a dict
+    :return: URL with decoded, sorted query parameters
+    """
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((key, str(value)) for key, value in params.items())
+    query.sort()
+    return urllib.parse.urlunsplit(
+        (parts.scheme, parts.netloc, parts.path, urllib.parse.urlencode(query), "")
+    )
+
+
+def cache_key(url, params=None):
+    return hashlib.sha256(canonical_url(url, params).encode("utf-8")).hexdigest()
+
+
+def season_ttl(end_date):
+    """
+    Picks a TTL for a query covering games up to end_date.
+
+    :param end_date: Last date of the query window in "YYYY-MM-DD" format
+    :return: None (keep forever) once the window is over, else CURRENT_SEASON_TTL
+    """
+    if end_date < date.today().isoformat():
+        return None
+    return CURRENT_SEASON_TTL
+
+
+# Function to tell whether a game dated game_date ("YYYY-MM-DD...", or None if
+# unknown) is over, so its responses can be cached forever
+def game_finished(game_date):
+    return game_date is not None and str(game_date)[:10] < date.today().isoformat()
+
+
+def get(url, params=None, ttl=None, session=None, timeout=30, limiter=None):
+    """
+    GETs a URL through the on-disk response cache.
+
+    Only 200 responses are stored, with their ETag and Last-Modified headers.
+    When a stored response has expired, those validators are sent as
+    If-None-Match/If-Modified-Since, and a 304 answer renews the stored body
+    instead of downloading it again. In offline mode a cached body is
+    returned regardless of age and a miss returns a 504 response without any
+    request.
+
+    :param url: Request URL
+    :param params: Query parameters as a dict
+    :param ttl: Seconds a stored response stays fresh, or None to keep it forever
+    :param session: Optional requests.Session (or anything with its get()) to send the request with
+    :param timeout: Request timeout in seconds
+    :param limiter: Optional object whose acquire() is called before a network request
+    :return: CachedResponse
+    """
+    key = cache_key(url, params)
+    conn = _connection()
+    row = conn.execute(
+        "SELECT body, expires_at, etag, last_modified FROM responses WHERE key = ?", (key,)
+    ).fetchone()
+
+    now = time.time()
+    if row is not None and (OFFLINE or row[1] is None or row[1] > now):
+        _count("hits")
+        return CachedResponse(200, row[0], from_cache=True)
+
+    _count("misses")
+    if OFFLINE:
+        return CachedResponse(504, f"Offline mode: no cached response for {url}")
+
+    headers = {}
+    if row is not None:
+        if row[2]:
+            headers["If-None-Match"] = row[2]
+        if row[3]:
+            headers["If-Modified-Since"] = row[3]
+
+    if limiter is not None:
+        with tracing.stage("http.rate_limit_wait"):
+            limiter.acquire()
+    if session is None:
+        # Imported here so cache hits and offline runs never load requests
+        import requests
+        session = requests
+
+    _count("network")
+    sent_at = time.perf_counter()
+    response = session.get(url, params=params, timeout=timeout, headers=headers or None)
+    tracing.record_request(time.perf_counter() - sent_at, response.status_code)
+    expires_at = None if ttl is None else now + ttl
+
+    if response.status_code == 304 and row is not None:
+        _count("revalidated")
+        conn.execute("UPDATE responses SET fetched_at = ?, expires_at = ? WHERE key = ?", (now, expires_at, key))
+        conn.commit()
+        return CachedResponse(200, row[0], from_cache=True)
+
+    if response.status_code == 200:
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, url, body, fetched_at, expires_at, etag, last_modified)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, canonical_url(url, params), response.text, now, expires_at,
+             response.headers.get("ETag"), response.headers.get("Last-Modified")),
+        )
+        conn.commit()
+
+    return CachedResponse(response.status_code, response.text)
+
+
+# Function to change how long a stored response stays fresh: None keeps it
+# forever (e.g. once a game is final), 0 expires it now
+def set_ttl(url, ttl, params=None):
+    expires_at = None if ttl is None else time.time() + ttl
+    conn = _connection()
+    conn.execute("UPDATE responses SET expires_at = ? WHERE key = ?", (expires_at, cache_key(url, params)))
+    conn.commit()
+
+
+# Function to drop every stored response (or only the expired ones)
+def clear(expired_only=False):
+    conn = _connection()
+    if expired_only:
+        conn.execute(
+            "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),),
+        )
+    else:
+        conn.execute("DELETE FROM responses")
+    conn.commit()
@@ -0,0 +1,28 @@
+import importlib
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on its first attribute access, so
+    a script can parse its arguments (and answer --help) before paying for
+    pandas, NumPy and the modules built on them.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            # import_module takes the import lock, so racing threads share one module
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+# Function to get a module that is only imported once it is actually used
+def lazy_import(name):
+    return LazyModule(name)
@@ -0,0 +1,121 @@
+import os
+import urllib.parse
+
+import numpy as np
+import pandas as pd
+
+import http_cache
+import pagination
+import storage
+import team_directory
+import travel
+from team_mapping import nhl_venue_mapping
+
+BASE_URL = http_cache.BASE_URL
+
+# Page size for /game; a full league season is ~1,400 games
+PAGE_SIZE = 500
+
+LEAGUE_DATASET_DIR = "league_game_history.parquet"
+LEAGUE_CSV_DIR = "league_game_history"
+
+
+def get_league_games(start_date, end_date, page_size=PAGE_SIZE):
+    """
+    Fetches every game in a date window once for the whole league, paging
+    through /game with start/limit until `total` rows have been read.
+
+    :param start_date: Start date in YYYY-MM-DD format
+    :param end_date: End date in YYYY-MM-DD format
+    :param page_size: Rows requested per page
+    :return: List of games, deduplicated by game ID
+    """
+    query = f"gameDate>='{start_date}' and gameDate<='{end_date}'"
+    url = f"{BASE_URL}/game?cayenneExp={urllib.parse.quote(query)}"
+    ttl = http_cache.season_ttl(end_date)
+
+    games = {}
+    try:
+        for game in pagination.iter_rows(url, page_size=page_size, prefetch=True, ttl=ttl):
+            games[game["id"]] = game
+    except RuntimeError as e:
+        print(f"Error fetching league games for {start_date} - {end_date}: {e}")
+
+    return list(games.values())
+
+
+def team_perspective_rows(games, season):
+    """
+    Fans each game out into two rows, one from each team's point of view.
+
+    :param games: List of /game rows
+    :param season: Season label, e.g. "2023-2024"
+    :return: DataFrame with one row per team per game
+    """
+    if not games:
+        return pd.DataFrame()
+
+    team_id_map = team_directory.get_team_id_map() or {}
+    raw = pd.DataFrame(games).drop_duplicates("id")
+    home_names = raw["homeTeamId"].map(lambda team_id: team_id_map.get(team_id, f"Unknown Team ({team_id})"))
+    away_names = raw["visitingTeamId"].map(lambda team_id: team_id_map.get(team_id, f"Unknown Team ({team_id})"))
+
+    def perspective(team, opponent, location, scored, conceded):
+        return pd.DataFrame({
+            "Team": team.to_numpy(),
+            "Season": season,
+            "Game Location": location,
+            "Opponent Team": opponent.to_numpy(),
+            "Goals Scored": scored.to_numpy(),
+            "Goals Conceded": conceded.to_numpy(),
+            "Result": np.where(scored.to_numpy() > conceded.to_numpy(), "Win", "Loss"),
+            "Game Date": raw["gameDate"].astype(str).str[:10].to_numpy(),
+            "Game ID": raw["id"].to_numpy(),
+        })
+
+    rows = pd.concat([
+        perspective(home_names, away_names, "Home", raw["homeScore"], raw["visitingScore"]),
+        perspective(away_names, home_names, "Away", raw["visitingScore"], raw["homeScore"]),
+    ], ignore_index=True)
+
+    cities = {name: info["city"] for name, info in nhl_venue_mapping.items()}
+    rows["City"] = rows["Opponent Team"].map(cities).fillna("Unknown")
+    return rows
+
+
+# Function to turn a team name into a file-name friendly slug
+def team_slug(team_name):
+    return team_name.lower().replace(".", "").replace(" ", "_")
+
+
+def process_league_season(start_year, start_date=None, end_date=None, csv_dir=LEAGUE_CSV_DIR,
+                          parquet_dir=None):
+    """
+    Fetches one season for all teams with a single paged /game pull, computes
+    travel and rest for every team, and writes the rows partitioned by team.
+
+    :param start_year: First calendar year of the season
+    :param start_date: Window start, defaulting to October 1
+    :param end_date: Window end, defaulting to April 15
+    :param csv_dir: Directory for per-team season CSVs, or None to skip
+    :param parquet_dir: Parquet dataset root (Team=/Season= partitions), or None to skip
+    :return: DataFrame of team-perspective rows with travel columns
+    """
+    season = f"{start_year}-{start_year + 1}"
+    games = get_league_games(start_date or f"{start_year}-10-01", end_date or f"{start_year + 1}-04-15")
+    rows = team_perspective_rows(games, season)
+    if rows.empty:
+        print(f"No league games found for season {season}.")
+        return rows
+
+    rows = travel.compute_travel(rows)
+    for team_name, team_rows in rows.groupby("Team", sort=False):
+        if csv_dir:
+            os.makedirs(csv_dir, exist_ok=True)
+            filename = os.path.join(csv_dir, f"{team_slug(team_name)}_game_history_{season}.csv")
+            team_rows.to_csv(filename, index=False)
+        if parquet_dir:
+            storage.write_partition(
+                storage.to_frame(team_rows, team_name), parquet_dir, {"Team": team_name, "Season": season}
+            )
+    return rows
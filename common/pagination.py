@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import fetch_engine
+
+# Rows requested per page unless the caller asks otherwise
+PAGE_SIZE = 100
+
+
+# Function to fetch one page and return (rows, total)
+def _fetch_page(url, params, start, page_size, ttl):
+    page_params = dict(params or {}, start=start, limit=page_size)
+    response = fetch_engine.get(url, params=page_params, ttl=ttl)
+    if response.status_code != 200:
+        raise RuntimeError(f"Error fetching {url} (start={start}): HTTP {response.status_code}")
+
+    payload = response.json()
+    rows = payload.get("data", [])
+    return rows, payload.get("total", start + len(rows))
+
+
+def iter_pages(url, params=None, page_size=PAGE_SIZE, prefetch=False, ttl=None):
+    """
+    Lazily walks a stats REST endpoint (/game, /skater/summary,
+    /goalie/summary, /team/summary, ...) page by page using start/limit,
+    stopping once `total` rows have been read.
+
+    Requests go through fetch_engine, so pages share one pooled connection
+    and the response cache. At most one page is held at a time, or two with
+    prefetch, where the next page is requested while the caller works on
+    the current one.
+
+    :param url: Endpoint URL, optionally with a cayenneExp query string
+    :param params: Extra query parameters, e.g. {"sort": "playerId"}
+    :param page_size: Rows per page
+    :param prefetch: Fetch the next page in the background
+    :param ttl: Cache TTL for each page
+    :return: Generator of row lists
+    """
+    start = 0
+    rows, total = _fetch_page(url, params, start, page_size, ttl)
+
+    if not prefetch:
+        while rows:
+            yield rows
+            start += len(rows)
+            if start >= total:
+                return
+            rows, total = _fetch_page(url, params, start, page_size, ttl)
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        while rows:
+            start += len(rows)
+            upcoming = pool.submit(_fetch_page, url, params, start, page_size, ttl) if start < total else None
+            yield rows
+            if upcoming is None:
+                return
+            rows, total = upcoming.result()
+
+
+def iter_rows(url, params=None, page_size=PAGE_SIZE, prefetch=False, ttl=None):
+    """
+    Same as iter_pages(), but yields individual rows as they arrive.
+    """
+    for rows in iter_pages(url, params, page_size, prefetch, ttl):
+        yield from rows
@@ -0,0 +1,71 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+# Columns of the raw /game table handed from the fetch threads to the worker processes
+GAME_TABLE_DTYPES = {
+    "id": np.int64,
+    "gameDate": "datetime64[D]",
+    "homeTeamId": np.int16,
+    "visitingTeamId": np.int16,
+    "homeScore": np.int16,
+    "visitingScore": np.int16,
+}
+
+
+def save_games_table(games, path):
+    """
+    Writes raw /game rows as an uncompressed .npz of typed columns, so a
+    worker process can load a season without unpickling a list of dicts.
+
+    :param games: List of /game rows
+    :param path: Output .npz path
+    :return: path
+    """
+    columns = {}
+    for column, dtype in GAME_TABLE_DTYPES.items():
+        if column == "gameDate":
+            columns[column] = np.array([str(game[column])[:10] for game in games], dtype=dtype)
+        else:
+            columns[column] = np.array([game.get(column) or 0 for game in games], dtype=dtype)
+    with open(path, "wb") as f:
+        np.savez(f, **columns)
+    return path
+
+
+# Function to read a table written by save_games_table back into /game-shaped rows
+def load_games_table(path):
+    with np.load(path) as table:
+        # tolist() turns datetime64[D] into datetime.date, so dates are not re-parsed
+        columns = {column: table[column].tolist() for column in GAME_TABLE_DTYPES}
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def run_pipeline(fetch, enrich, items, processes=None, concurrency=None, initializer=None, initargs=()):
+    """
+    Runs fetch(item) on a thread pool and hands each result to enrich() in a
+    process pool as soon as it is ready, so network waits and CPU-bound work
+    overlap and the CPU work is spread over several cores.
+
+    Workers are started with the "spawn" method: forking a process that has
+    fetch threads and open SQLite connections is not safe.
+
+    :param fetch: I/O-bound function of one item, returning something small
+        and picklable (e.g. a file path)
+    :param enrich: CPU-bound function of fetch's result; must be picklable
+        (a module-level function or a functools.partial of one)
+    :param items: Iterable of items, e.g. season start years
+    :param processes: Worker processes, defaulting to the number of cores
+    :param concurrency: Fetch threads
+    :param initializer: Called once in every worker process
+    :param initargs: Arguments for initializer
+    :return: List of enrich results in completion order
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context,
+                             initializer=initializer, initargs=initargs) as pool, \
+            ThreadPoolExecutor(max_workers=concurrency) as threads:
+        fetches = [threads.submit(fetch, item) for item in items]
+        enriched = [pool.submit(enrich, future.result()) for future in as_completed(fetches)]
+        return [future.result() for future in enriched]
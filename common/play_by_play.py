@@ -0,0 +1,188 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import fetch_engine
+import http_cache
+
+WEB_BASE_URL = http_cache.WEB_BASE_URL
+
+# typeDescKey values from the gamecenter feed, interned to small integer codes.
+# Anything not listed is stored as 0 ("other").
+EVENT_TYPES = [
+    "other", "faceoff", "hit", "giveaway", "takeaway", "shot-on-goal", "missed-shot",
+    "blocked-shot", "goal", "penalty", "delayed-penalty", "stoppage", "period-start",
+    "period-end", "game-end", "shootout-complete", "failed-shot-attempt",
+]
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+SHOT_ON_GOAL = EVENT_CODES["shot-on-goal"]
+GOAL = EVENT_CODES["goal"]
+
+# Column name -> dtype of the compact event table
+EVENT_DTYPES = {
+    "game_id": np.int32,
+    "event_id": np.int32,
+    "event_type": np.int8,
+    "period": np.int8,
+    "seconds": np.int16,
+    "team_id": np.int16,
+    "x": np.float32,
+    "y": np.float32,
+}
+
+PBP_COLUMNS = ["Shots For", "Shots Against", "PBP Goals For", "PBP Goals Against"]
+
+
+# Function to turn "MM:SS" into seconds
+def clock_seconds(clock):
+    minutes, _, seconds = (clock or "0:00").partition(":")
+    return int(minutes) * 60 + int(seconds or 0)
+
+
+def fetch_game_payload(game_id, game_date=None):
+    """
+    Fetches one game's play-by-play feed. Games dated before today are
+    cached forever; anything else gets the current-season TTL.
+
+    :param game_id: NHL game ID, e.g. 2023020204
+    :param game_date: Game date in "YYYY-MM-DD" format, if known
+    :return: Parsed JSON payload, or None on error
+    """
+    finished = http_cache.game_finished(game_date)
+    ttl = None if finished else http_cache.CURRENT_SEASON_TTL
+    response = fetch_engine.get(f"{WEB_BASE_URL}/gamecenter/{game_id}/play-by-play", ttl=ttl)
+    if response.status_code != 200:
+        print(f"Error fetching play-by-play for game {game_id}")
+        return None
+    return response.json()
+
+
+def parse_events(game_id, payload):
+    """
+    Flattens a play-by-play payload into typed column arrays.
+
+    :param game_id: NHL game ID
+    :param payload: JSON payload from fetch_game_payload
+    :return: Dict of column name -> NumPy array (see EVENT_DTYPES)
+    """
+    plays = payload.get("plays", [])
+    columns = {name: np.empty(len(plays), dtype=dtype) for name, dtype in EVENT_DTYPES.items()}
+    columns["game_id"][:] = game_id
+
+    for i, play in enumerate(plays):
+        details = play.get("details") or {}
+        columns["event_id"][i] = play.get("eventId", i)
+        columns["event_type"][i] = EVENT_CODES.get(play.get("typeDescKey"), 0)
+        columns["period"][i] = (play.get("periodDescriptor") or {}).get("number", 0)
+        columns["seconds"][i] = clock_seconds(play.get("timeInPeriod"))
+        columns["team_id"][i] = details.get("eventOwnerTeamId") or 0
+        columns["x"][i] = details.get("xCoord", np.nan)
+        columns["y"][i] = details.get("yCoord", np.nan)
+    return columns
+
+
+# Function to concatenate per-game column dicts into one table
+def concat_events(parts):
+    if not parts:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in EVENT_DTYPES.items()}
+    return {name: np.concatenate([part[name] for part in parts]) for name in EVENT_DTYPES}
+
+
+def fetch_events(games):
+    """
+    Fetches and parses play-by-play for many games concurrently.
+
+    :param games: Iterable of dicts with "Game ID" and "Game Date"
+        (the per-game rows) or "id" and "gameDate" (raw /game rows)
+    :return: (events, game_teams) where events is the compact column table and
+        game_teams maps game ID -> (home team ID, away team ID)
+    """
+    keys = []
+    for game in games:
+        game_id = game.get("Game ID", game.get("id"))
+        if game_id is None or game_id == "" or pd.isna(game_id):
+            continue
+        keys.append((int(game_id), game.get("Game Date", game.get("gameDate"))))
+    payloads = fetch_engine.run_concurrently(lambda key: fetch_game_payload(*key), keys)
+
+    parts = []
+    game_teams = {}
+    for (game_id, _), payload in zip(keys, payloads):
+        if payload is None:
+            continue
+        parts.append(parse_events(game_id, payload))
+        game_teams[game_id] = (
+            (payload.get("homeTeam") or {}).get("id", 0),
+            (payload.get("awayTeam") or {}).get("id", 0),
+        )
+    return concat_events(parts), game_teams
+
+
+# Function to save the event table (and each game's home/away team IDs) as an
+# uncompressed .npz, which loads back in milliseconds
+def save_events(events, game_teams, path):
+    game_ids = np.array(sorted(game_teams), dtype=np.int32)
+    teams = np.array([game_teams[game_id] for game_id in game_ids], dtype=np.int16).reshape(-1, 2)
+
+    tmp_file = f"{path}.tmp.npz"
+    np.savez(tmp_file, games=game_ids, game_teams=teams, **events)
+    os.replace(tmp_file, path)
+
+
+# Function to load an event table written by save_events
+def load_events(path):
+    with np.load(path) as data:
+        events = {name: data[name] for name in EVENT_DTYPES}
+        game_teams = {
+            int(game_id): (int(home), int(away))
+            for game_id, (home, away) in zip(data["games"], data["game_teams"])
+        }
+    return events, game_teams
+
+
+def shot_goal_aggregates(events, game_teams):
+    """
+    Counts shots on goal (goals included) and goals for each side of every game.
+
+    :param events: Compact event table
+    :param game_teams: Dict of game ID -> (home team ID, away team ID)
+    :return: DataFrame indexed by game ID with Home/Away Shots and Goals columns
+    """
+    game_ids = np.array(sorted(game_teams), dtype=np.int64)
+    home_ids = np.array([game_teams[game_id][0] for game_id in game_ids], dtype=np.int64)
+
+    game_idx = np.searchsorted(game_ids, events["game_id"])
+    is_home = events["team_id"] == home_ids[game_idx]
+    is_goal = events["event_type"] == GOAL
+    is_shot = (events["event_type"] == SHOT_ON_GOAL) | is_goal
+
+    n = len(game_ids)
+    return pd.DataFrame({
+        "Home Shots": np.bincount(game_idx[is_shot & is_home], minlength=n),
+        "Away Shots": np.bincount(game_idx[is_shot & ~is_home], minlength=n),
+        "Home Goals": np.bincount(game_idx[is_goal & is_home], minlength=n),
+        "Away Goals": np.bincount(game_idx[is_goal & ~is_home], minlength=n),
+    }, index=pd.Index(game_ids, name="Game ID"))
+
+
+def join_aggregates(game_data, aggregates):
+    """
+    Adds Shots For/Against and PBP Goals For/Against to per-game rows from
+    the point of view of the team each row belongs to.
+
+    :param game_data: List of game dicts with "Game ID" and "Game Location"
+    :param aggregates: DataFrame from shot_goal_aggregates
+    :return: The same list, with PBP_COLUMNS filled where events were found
+    """
+    for game in game_data:
+        game_id = game.get("Game ID")
+        if game_id is None or pd.isna(game_id) or int(game_id) not in aggregates.index:
+            continue
+        counts = aggregates.loc[int(game_id)]
+        own, other = ("Home", "Away") if game["Game Location"] == "Home" else ("Away", "Home")
+        game["Shots For"] = int(counts[f"{own} Shots"])
+        game["Shots Against"] = int(counts[f"{other} Shots"])
+        game["PBP Goals For"] = int(counts[f"{own} Goals"])
+        game["PBP Goals Against"] = int(counts[f"{other} Goals"])
+    return game_data
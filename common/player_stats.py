@@ -0,0 +1,196 @@
+import json
+import sqlite3
+
+import fetch_engine
+import http_cache
+import pagination
+import team_directory
+
+BASE_URL = http_cache.BASE_URL
+
+# Default warehouse file, next to the other outputs
+DATABASE_FILE = "player_stats.sqlite3"
+
+SKATER_STATS = [
+    "gamesPlayed", "goals", "assists", "points", "plusMinus", "penaltyMinutes",
+    "ppGoals", "ppPoints", "shGoals", "gameWinningGoals", "shots", "timeOnIcePerGame",
+]
+GOALIE_STATS = [
+    "gamesPlayed", "gamesStarted", "wins", "losses", "otLosses", "shotsAgainst",
+    "saves", "goalsAgainst", "shutouts", "timeOnIce",
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS skater_seasons (
+    playerId INTEGER NOT NULL,
+    seasonId INTEGER NOT NULL,
+    fullName TEXT,
+    positionCode TEXT,
+    teamAbbrevs TEXT,
+    {", ".join(f"{stat} REAL" for stat in SKATER_STATS)},
+    raw TEXT,
+    PRIMARY KEY (playerId, seasonId)
+);
+CREATE TABLE IF NOT EXISTS goalie_seasons (
+    playerId INTEGER NOT NULL,
+    seasonId INTEGER NOT NULL,
+    fullName TEXT,
+    teamAbbrevs TEXT,
+    {", ".join(f"{stat} REAL" for stat in GOALIE_STATS)},
+    raw TEXT,
+    PRIMARY KEY (playerId, seasonId)
+);
+CREATE TABLE IF NOT EXISTS player_teams (
+    playerId INTEGER NOT NULL,
+    seasonId INTEGER NOT NULL,
+    teamId INTEGER,
+    teamAbbrev TEXT NOT NULL,
+    PRIMARY KEY (playerId, seasonId, teamAbbrev)
+);
+CREATE INDEX IF NOT EXISTS idx_skater_season ON skater_seasons (seasonId);
+CREATE INDEX IF NOT EXISTS idx_goalie_season ON goalie_seasons (seasonId);
+CREATE INDEX IF NOT EXISTS idx_player_teams_team ON player_teams (teamId, seasonId);
+CREATE INDEX IF NOT EXISTS idx_player_teams_season ON player_teams (seasonId);
+"""
+
+
+# Function to open the warehouse and make sure the tables and indexes exist
+def connect(path=DATABASE_FILE):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# Function to fetch every row of a summary endpoint for one season
+def fetch_summary(kind, season_id, page_size=-1):
+    start_year = int(str(season_id)[:4])
+    url = f"{BASE_URL}/{kind}/summary"
+    params = {"isAggregate": "false", "isGame": "false", "cayenneExp": f"seasonId={season_id}"}
+    ttl = http_cache.season_ttl(f"{start_year + 1}-06-30")
+    try:
+        return list(pagination.iter_rows(url, params=params, page_size=page_size, ttl=ttl))
+    except RuntimeError as e:
+        print(f"Error fetching {kind} summary for {season_id}: {e}")
+        return []
+
+
+# Function to map team tri-codes (e.g. "VAN") to stats API team IDs
+def _team_ids_by_abbrev():
+    teams = team_directory.load_teams() or []
+    return {team.get("triCode"): team["id"] for team in teams if team.get("triCode")}
+
+
+def _store_season(conn, table, stats, rows, name_field, team_ids):
+    columns = ["playerId", "seasonId", "fullName", "teamAbbrevs"] + stats + ["raw"]
+    if table == "skater_seasons":
+        columns.insert(3, "positionCode")
+
+    records = []
+    team_records = []
+    for row in rows:
+        record = {
+            "playerId": row["playerId"],
+            "seasonId": row["seasonId"],
+            "fullName": row.get(name_field),
+            "positionCode": row.get("positionCode"),
+            "teamAbbrevs": row.get("teamAbbrevs"),
+            "raw": json.dumps(row),
+        }
+        record.update({stat: row.get(stat) for stat in stats})
+        records.append(tuple(record[column] for column in columns))
+
+        for abbrev in (row.get("teamAbbrevs") or "").split(","):
+            abbrev = abbrev.strip()
+            if abbrev:
+                team_records.append((row["playerId"], row["seasonId"], team_ids.get(abbrev), abbrev))
+
+    placeholders = ", ".join("?" for _ in columns)
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", records
+    )
+    conn.executemany("INSERT OR REPLACE INTO player_teams VALUES (?, ?, ?, ?)", team_records)
+
+
+def load_seasons(conn, start_years, page_size=-1):
+    """
+    Bulk-loads /skater/summary and /goalie/summary for every season into the
+    warehouse. Seasons are fetched concurrently and written in one
+    transaction each, so a re-run replaces rows rather than duplicating them.
+
+    :param conn: Connection from connect()
+    :param start_years: Iterable of first calendar years, e.g. range(2010, 2024)
+    :param page_size: Rows per request; -1 asks for everything at once
+    :return: Number of skater and goalie rows stored
+    """
+    season_ids = [int(f"{year}{year + 1}") for year in start_years]
+    team_ids = _team_ids_by_abbrev()
+    skaters = fetch_engine.run_concurrently(lambda season_id: fetch_summary("skater", season_id, page_size), season_ids)
+    goalies = fetch_engine.run_concurrently(lambda season_id: fetch_summary("goalie", season_id, page_size), season_ids)
+
+    stored = 0
+    for skater_rows, goalie_rows in zip(skaters, goalies):
+        with conn:
+            _store_season(conn, "skater_seasons", SKATER_STATS, skater_rows, "skaterFullName", team_ids)
+            _store_season(conn, "goalie_seasons", GOALIE_STATS, goalie_rows, "goalieFullName", team_ids)
+        stored += len(skater_rows) + len(goalie_rows)
+    return stored
+
+
+# Function to reject stat names that are not warehouse columns
+def _check_stat(stat, allowed):
+    if stat not in allowed:
+        raise ValueError(f"Unknown stat {stat!r}; choose one of {', '.join(allowed)}")
+
+
+def career_totals(conn, player_id=None, name=None, goalie=False):
+    """
+    Career totals summed over every stored season.
+
+    :param conn: Connection from connect()
+    :param player_id: Restrict to one player
+    :param name: Case-insensitive substring of the player's name
+    :param goalie: Query goalie rather than skater stats
+    :return: List of sqlite3.Row
+    """
+    table, stats = ("goalie_seasons", GOALIE_STATS) if goalie else ("skater_seasons", SKATER_STATS)
+    summed = ", ".join(f"SUM({stat}) AS {stat}" for stat in stats if stat != "timeOnIcePerGame")
+    where, params = [], []
+    if player_id is not None:
+        where.append("playerId = ?")
+        params.append(player_id)
+    if name:
+        where.append("fullName LIKE ?")
+        params.append(f"%{name}%")
+
+    sql = (
+        f"SELECT playerId, MAX(fullName) AS fullName, COUNT(*) AS seasons, {summed} FROM {table}"
+        + (f" WHERE {' AND '.join(where)}" if where else "")
+        + " GROUP BY playerId ORDER BY gamesPlayed DESC"
+    )
+    return conn.execute(sql, params).fetchall()
+
+
+def season_leaders(conn, season_id, stat="points", limit=10, team_id=None, goalie=False):
+    """
+    Top players of a season by one stat, optionally for a single team.
+
+    :param conn: Connection from connect()
+    :param season_id: Season in "YYYYYYYY" form, e.g. 20232024
+    :param stat: Column from SKATER_STATS (or GOALIE_STATS)
+    :param limit: Number of rows
+    :param team_id: Stats API team ID to restrict to
+    :param goalie: Query goalie rather than skater stats
+    :return: List of sqlite3.Row
+    """
+    table, stats = ("goalie_seasons", GOALIE_STATS) if goalie else ("skater_seasons", SKATER_STATS)
+    _check_stat(stat, stats)
+
+    sql = f"SELECT s.playerId, s.fullName, s.teamAbbrevs, s.{stat} FROM {table} s"
+    params = [int(season_id)]
+    if team_id is not None:
+        sql += " JOIN player_teams t ON t.playerId = s.playerId AND t.seasonId = s.seasonId AND t.teamId = ?"
+        params.insert(0, team_id)
+    sql += f" WHERE s.seasonId = ? ORDER BY s.{stat} DESC LIMIT ?"
+    params.append(limit)
+    return conn.execute(sql, params).fetchall()
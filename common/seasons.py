@@ -0,0 +1,90 @@
+import http_cache
+import team_directory
+
+BASE_URL = http_cache.BASE_URL
+
+# Season boundaries only change when a new season is scheduled
+SEASON_CACHE_TTL = 24 * 60 * 60
+FRANCHISE_CACHE_TTL = 7 * 24 * 60 * 60
+
+
+def load_seasons():
+    """
+    Returns every season from /season with its real boundaries, oldest first.
+
+    Each season is a dict with "id" (e.g. 20232024), "startYear",
+    "startDate" and "endDate" ("YYYY-MM-DD"). The window runs from opening
+    night to the end of the playoffs, so early openers, playoff games and
+    lockout-shortened schedules are all covered.
+
+    :return: List of season dicts, or None if the API call failed
+    """
+    response = http_cache.get(f"{BASE_URL}/season", ttl=SEASON_CACHE_TTL)
+    if response.status_code != 200:
+        print("Error fetching season data.")
+        return None
+
+    seasons = []
+    for row in response.json().get("data", []):
+        season_id = row.get("id")
+        if season_id is None or not row.get("startDate") or not row.get("endDate"):
+            continue
+        seasons.append({
+            "id": int(season_id),
+            "startYear": int(str(season_id)[:4]),
+            "startDate": row["startDate"][:10],
+            "endDate": row["endDate"][:10],
+        })
+    return sorted(seasons, key=lambda season: season["id"])
+
+
+def franchise_first_year(team_id):
+    """
+    First calendar year of the franchise a team belongs to, from /franchise.
+
+    :param team_id: Stats API team ID
+    :return: Year, e.g. 1970 for the Canucks, or None if it cannot be found
+    """
+    team = next((team for team in team_directory.load_teams() or [] if team["id"] == team_id), None)
+    response = http_cache.get(f"{BASE_URL}/franchise", ttl=FRANCHISE_CACHE_TTL)
+    if response.status_code != 200:
+        print("Error fetching franchise data.")
+        return None
+
+    franchise_id = (team or {}).get("franchiseId")
+    for franchise in response.json().get("data", []):
+        if franchise.get("id") == franchise_id or franchise.get("mostRecentTeamId") == team_id:
+            if franchise.get("firstSeasonId"):
+                return int(str(franchise["firstSeasonId"])[:4])
+    return None
+
+
+def active_teams():
+    """
+    The clubs playing today: the most recent team of every franchise that
+    has no lastSeasonId in /franchise, as listed by /team. Unlike
+    nhl_team_mapping this follows relocations and renames (e.g. Arizona to
+    Utah) as soon as the API does.
+
+    :return: List of team dicts from /team, or None if an API call failed
+    """
+    teams = team_directory.load_teams()
+    response = http_cache.get(f"{BASE_URL}/franchise", ttl=FRANCHISE_CACHE_TTL)
+    if teams is None or response.status_code != 200:
+        print("Error fetching franchise data.")
+        return None
+
+    current_ids = {
+        franchise.get("mostRecentTeamId")
+        for franchise in response.json().get("data", [])
+        if not franchise.get("lastSeasonId")
+    }
+    return [team for team in teams if team["id"] in current_ids]
+
+
+# Function to list the seasons from first_year up to the latest one
+def seasons_since(first_year):
+    seasons = load_seasons()
+    if seasons is None:
+        return None
+    return [season for season in seasons if season["startYear"] >= first_year]
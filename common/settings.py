@@ -0,0 +1,16 @@
+import os
+
+# Base URL of the stats REST API; point it at a local stub server for testing
+BASE_URL = os.environ.get("NHL_STATS_BASE_URL", "https://api.nhle.com/stats/rest/en")
+
+# Base URL of the web API (gamecenter, schedules, ...)
+WEB_BASE_URL = os.environ.get("NHL_WEB_BASE_URL", "https://api-web.nhle.com/v1")
+
+# Directory used for on-disk caches shared by every script in the repo
+CACHE_DIR = os.environ.get(
+    "CANUCKS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"),
+)
+
+# Default location of the Parquet dataset, next to the per-season CSVs
+DATASET_DIR = "canucks_game_history.parquet"
@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+import fetch_engine
+import http_cache
+import play_by_play
+
+BASE_URL = http_cache.BASE_URL
+
+# typeCode of a regular shift row (other codes are goal/penalty markers)
+SHIFT_TYPE_CODE = 517
+PERIOD_SECONDS = 20 * 60
+
+FORWARD_POSITIONS = {"C", "L", "R"}
+DEFENCE_POSITIONS = {"D"}
+
+
+def fetch_shifts(game_id, game_date=None):
+    """
+    Fetches one game's shift chart and returns it as typed arrays with times
+    measured in seconds from the start of the game.
+
+    :param game_id: NHL game ID
+    :param game_date: Game date in "YYYY-MM-DD" format, used for cache TTL
+    :return: DataFrame with game_id, player_id, team_id, start and end columns
+    """
+    finished = http_cache.game_finished(game_date)
+    ttl = None if finished else http_cache.CURRENT_SEASON_TTL
+    response = fetch_engine.get(f"{BASE_URL}/shiftcharts", params={"cayenneExp": f"gameId={game_id}"}, ttl=ttl)
+    if response.status_code != 200:
+        print(f"Error fetching shift chart for game {game_id}")
+        return None
+
+    rows = [
+        row for row in response.json().get("data", [])
+        if row.get("typeCode", SHIFT_TYPE_CODE) == SHIFT_TYPE_CODE and row.get("startTime") and row.get("endTime")
+    ]
+    period_start = np.array([(row["period"] - 1) * PERIOD_SECONDS for row in rows], dtype=np.int32)
+    return pd.DataFrame({
+        "game_id": np.full(len(rows), game_id, dtype=np.int32),
+        "player_id": np.array([row["playerId"] for row in rows], dtype=np.int32),
+        "team_id": np.array([row["teamId"] for row in rows], dtype=np.int16),
+        "start": period_start + np.array([play_by_play.clock_seconds(row["startTime"]) for row in rows], dtype=np.int32),
+        "end": period_start + np.array([play_by_play.clock_seconds(row["endTime"]) for row in rows], dtype=np.int32),
+    })
+
+
+def fetch_positions(game_id, game_date=None):
+    """
+    Player positions for one game, taken from the play-by-play roster
+    (shift charts do not carry positions).
+
+    :return: Dict of player ID -> position code ("C", "L", "R", "D", "G")
+    """
+    payload = play_by_play.fetch_game_payload(game_id, game_date)
+    if payload is None:
+        return {}
+    return {spot["playerId"]: spot.get("positionCode") for spot in payload.get("rosterSpots", [])}
+
+
+def fetch_season_shifts(game_data):
+    """
+    Bulk-fetches shift charts and positions for every game in game_data.
+
+    :param game_data: List of game dicts with "Game ID" and "Game Date"
+    :return: (shifts DataFrame, dict of player ID -> position code)
+    """
+    keys = [
+        (int(game["Game ID"]), game["Game Date"])
+        for game in game_data
+        if game.get("Game ID") not in (None, "") and not pd.isna(game["Game ID"])
+    ]
+    shifts = fetch_engine.run_concurrently(lambda key: fetch_shifts(*key), keys)
+    rosters = fetch_engine.run_concurrently(lambda key: fetch_positions(*key), keys)
+
+    positions = {}
+    for roster in rosters:
+        positions.update(roster)
+    frames = [frame for frame in shifts if frame is not None and not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=["game_id", "player_id", "team_id", "start", "end"]), positions
+    return pd.concat(frames, ignore_index=True), positions
+
+
+def time_on_ice(shifts, team_id=None):
+    """
+    Total and per-game time on ice for each player.
+
+    :param shifts: DataFrame from fetch_season_shifts
+    :param team_id: Only count this team's players, if given
+    :return: DataFrame indexed by player_id with TOI seconds, games and TOI per game
+    """
+    if team_id is not None:
+        shifts = shifts[shifts["team_id"] == team_id]
+    duration = (shifts["end"] - shifts["start"]).clip(lower=0)
+    grouped = shifts.assign(duration=duration).groupby("player_id")
+    toi = pd.DataFrame({
+        "TOI Seconds": grouped["duration"].sum(),
+        "Games": grouped["game_id"].nunique(),
+    })
+    toi["TOI Per Game"] = toi["TOI Seconds"] / toi["Games"]
+    return toi.sort_values("TOI Seconds", ascending=False)
+
+
+def on_ice_segments(game_shifts):
+    """
+    Interval sweep over one team's shifts in one game.
+
+    Every shift start/end is a boundary; between consecutive boundaries the
+    group of players on the ice is constant. Shifts are added to a
+    (segments x players) difference array and cumulatively summed, so the
+    whole game resolves in a handful of NumPy operations.
+
+    :param game_shifts: Shifts of one team in one game
+    :return: (boundaries, on_ice, player_ids) where on_ice[i, j] says whether
+        player_ids[j] was on the ice from boundaries[i] to boundaries[i + 1]
+    """
+    starts = game_shifts["start"].to_numpy()
+    ends = game_shifts["end"].to_numpy()
+    player_ids, player_idx = np.unique(game_shifts["player_id"].to_numpy(), return_inverse=True)
+    boundaries = np.unique(np.concatenate([starts, ends]))
+
+    delta = np.zeros((len(boundaries), len(player_ids)), dtype=np.int16)
+    np.add.at(delta, (np.searchsorted(boundaries, starts), player_idx), 1)
+    np.add.at(delta, (np.searchsorted(boundaries, ends), player_idx), -1)
+    on_ice = np.cumsum(delta, axis=0)[:-1] > 0
+    return boundaries, on_ice, player_ids
+
+
+def line_combinations(shifts, positions, team_id, group_size=3, position_codes=FORWARD_POSITIONS):
+    """
+    Time each forward line (or defence pair) spent on the ice together, and
+    the intervals it was out there.
+
+    :param shifts: DataFrame from fetch_season_shifts
+    :param positions: Dict of player ID -> position code
+    :param team_id: Team to analyse
+    :param group_size: 3 for forward lines, 2 for defence pairs
+    :param position_codes: FORWARD_POSITIONS or DEFENCE_POSITIONS
+    :return: (combinations, intervals): combinations has one row per player
+        group with total seconds and shift count; intervals has game_id,
+        players, start and end for every stretch the group was on the ice
+    """
+    eligible = [player_id for player_id, position in positions.items() if position in position_codes]
+    team_shifts = shifts[(shifts["team_id"] == team_id) & shifts["player_id"].isin(eligible)]
+
+    interval_frames = []
+    for game_id, game_shifts in team_shifts.groupby("game_id", sort=True):
+        if game_shifts.empty:
+            continue
+        boundaries, on_ice, player_ids = on_ice_segments(game_shifts)
+        if len(boundaries) < 2 or len(player_ids) > 63:
+            continue
+
+        # Encode each segment's group as a bitmask over this game's players
+        masks = on_ice.astype(np.int64) @ (np.int64(1) << np.arange(len(player_ids), dtype=np.int64))
+        keep = on_ice.sum(axis=1) == group_size
+
+        # Merge consecutive segments with the same group into one interval
+        change = np.ones(len(masks), dtype=bool)
+        change[1:] = (masks[1:] != masks[:-1]) | (keep[1:] != keep[:-1])
+        run_id = np.cumsum(change) - 1
+        run_start = boundaries[:-1][change]
+        run_end = np.zeros(run_id[-1] + 1, dtype=boundaries.dtype)
+        np.maximum.at(run_end, run_id, boundaries[1:])
+        run_mask = masks[change]
+        run_keep = keep[change]
+
+        bits = (run_mask[run_keep, None] >> np.arange(len(player_ids))) & 1
+        players = [tuple(int(player_id) for player_id in player_ids[row.astype(bool)]) for row in bits]
+        interval_frames.append(pd.DataFrame({
+            "game_id": game_id,
+            "players": players,
+            "start": run_start[run_keep],
+            "end": run_end[run_keep],
+        }))
+
+    if not interval_frames:
+        empty = pd.DataFrame(columns=["game_id", "players", "start", "end"])
+        return pd.DataFrame(columns=["players", "Seconds", "Shifts"]), empty
+
+    intervals = pd.concat(interval_frames, ignore_index=True)
+    combinations = (
+        intervals.assign(Seconds=intervals["end"] - intervals["start"])
+        .groupby("players")
+        .agg(Seconds=("Seconds", "sum"), Shifts=("Seconds", "size"))
+        .sort_values("Seconds", ascending=False)
+        .reset_index()
+    )
+    return combinations, intervals
@@ -0,0 +1,116 @@
+import os
+import uuid
+
+import pandas as pd
+
+from settings import DATASET_DIR
+from team_mapping import nhl_venue_mapping
+
+CATEGORY_COLUMNS = ["Team", "Season", "Game Location", "Opponent Team", "City", "Result"]
+FLOAT_COLUMNS = [
+    "Distance Traveled (miles)", "Time Zone Change", "Road Trip Miles",
+    "From (Latitude)", "From (Longitude)", "To (Latitude)", "To (Longitude)",
+]
+INT_COLUMNS = [
+    "Rest Days", "Road Trip Game", "Goals Scored", "Goals Conceded",
+    "Shots For", "Shots Against", "PBP Goals For", "PBP Goals Against",
+] + [
+    f"{stat} {side}"
+    for stat in ["Shots On Goal", "Goalie Saves", "PIM", "Hits", "Blocked Shots", "Power Play Goals"]
+    for side in ("For", "Against")
+]
+BOOL_COLUMNS = ["Back To Back"]
+
+
+def to_frame(game_data, team_name):
+    """
+    Converts per-game rows into a typed DataFrame ready for columnar storage.
+
+    Adds the team and its home/opponent arena coordinates as float columns
+    ("From" is the team's own arena, "To" the opponent's), the same layout
+    data-conversion/add-city.py expects.
+
+    :param game_data: List of game dicts or a DataFrame
+    :param team_name: Full name of the team the rows belong to
+    :return: DataFrame with categorical, datetime, float and integer dtypes
+    """
+    df = pd.DataFrame(game_data).copy()
+    if "Team" not in df.columns:
+        df["Team"] = team_name
+
+    home = df["Team"].map(lambda name: nhl_venue_mapping.get(name, {}).get("coordinates", (None, None)))
+    away = df["Opponent Team"].map(lambda name: nhl_venue_mapping.get(name, {}).get("coordinates", (None, None)))
+    df["From (Latitude)"] = home.str[0]
+    df["From (Longitude)"] = home.str[1]
+    df["To (Latitude)"] = away.str[0]
+    df["To (Longitude)"] = away.str[1]
+
+    df["Game Date"] = pd.to_datetime(df["Game Date"].astype(str).str[:10], format="%Y-%m-%d")
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    for column in FLOAT_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+    for column in INT_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int16")
+    for column in BOOL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("boolean")
+    return df
+
+
+def partition_path(root, partition):
+    """
+    Hive-style directory for one partition, e.g. root/Season=2010-2011.
+
+    :param root: Dataset directory
+    :param partition: Ordered dict of partition column -> value
+    :return: Directory path
+    """
+    return os.path.join(root, *(f"{column}={value}" for column, value in partition.items()))
+
+
+def write_partition(df, root=DATASET_DIR, partition=None):
+    """
+    Replaces one partition of the dataset with df, atomically.
+
+    The partition columns are dropped from the file itself; readers recover
+    them from the directory names.
+
+    :param df: Typed DataFrame (see to_frame)
+    :param root: Dataset directory
+    :param partition: Dict of partition column -> value, e.g. {"Season": "2010-2011"}
+    :return: Path of the written file
+    """
+    partition = partition or {}
+    directory = partition_path(root, partition)
+    os.makedirs(directory, exist_ok=True)
+
+    data = df.drop(columns=[column for column in partition if column in df.columns])
+    tmp_file = os.path.join(directory, f".part-{uuid.uuid4().hex}.tmp")
+    data.to_parquet(tmp_file, engine="pyarrow", index=False)
+
+    filename = os.path.join(directory, "part-0.parquet")
+    os.replace(tmp_file, filename)
+    return filename
+
+
+# Function to write one season of a team's games as its own partition
+def write_season(game_data, season, team_name, root=DATASET_DIR):
+    if len(game_data) == 0:
+        return None
+    return write_partition(to_frame(game_data, team_name), root, {"Season": season})
+
+
+def read_dataset(root=DATASET_DIR, columns=None, filters=None):
+    """
+    Loads the dataset, reading only the requested columns and partitions.
+
+    :param root: Dataset directory
+    :param columns: Column names to load, or None for all
+    :param filters: pyarrow filters, e.g. [("Season", "in", ["2022-2023"])]
+    :return: DataFrame
+    """
+    return pd.read_parquet(root, engine="pyarrow", columns=columns, filters=filters)
@@ -0,0 +1,68 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+# Default state file, kept next to the outputs it describes
+STATE_FILE = "canucks_sync_state.json"
+# Seasons the historical backfill has finished, per team
+CHECKPOINT_FILE = "canucks_backfill_checkpoint.json"
+
+# Seasons are processed on a thread pool, so updates are serialized
+_lock = threading.Lock()
+
+
+def load_state(path=STATE_FILE):
+    """
+    Reads the incremental sync state: for each team ID, the latest stored
+    game date and game ID.
+
+    :param path: JSON state file
+    :return: Dict of str(team_id) -> {"lastGameDate": ..., "lastGameId": ...}
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# Function to record the latest stored game for a team, atomically; an older
+# date never overwrites a newer one
+def save_team_state(team_id, last_game_date, last_game_id, path=STATE_FILE):
+    with _lock:
+        state = load_state(path)
+        previous = state.get(str(team_id))
+        if previous and previous["lastGameDate"] >= last_game_date:
+            return
+        state[str(team_id)] = {"lastGameDate": last_game_date, "lastGameId": last_game_id}
+        _write_atomic(state, path)
+
+
+# Function to replace a JSON state file without ever leaving it half written
+def _write_atomic(state, path):
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(state, f, indent=4)
+    os.replace(tmp_file, path)
+
+
+# Function to look up the latest stored game for a team
+def get_team_state(team_id, path=STATE_FILE):
+    return load_state(path).get(str(team_id))
+
+
+# Function to list the season IDs the backfill has already completed for a team
+def completed_seasons(team_id, path=CHECKPOINT_FILE):
+    return set(int(season_id) for season_id in load_state(path).get(str(team_id), {}))
+
+
+# Function to checkpoint one finished season of the backfill
+def mark_season_complete(team_id, season_id, games, path=CHECKPOINT_FILE):
+    with _lock:
+        state = load_state(path)
+        state.setdefault(str(team_id), {})[str(season_id)] = {
+            "games": games,
+            "completedAt": datetime.now().isoformat(timespec="seconds"),
+        }
+        _write_atomic(state, path)
@@ -0,0 +1,72 @@
+import http_cache
+import tracing
+
+BASE_URL = http_cache.BASE_URL
+
+# The team list only changes on expansion/relocation, so a week is plenty
+TEAM_CACHE_TTL = 7 * 24 * 60 * 60
+
+_teams = None
+_team_id_map = None
+
+
+def load_teams(force_refresh=False, ttl=TEAM_CACHE_TTL):
+    """
+    Returns the full /team list, fetching it at most once per run.
+
+    The list is kept in memory for the lifetime of the process, and the raw
+    response is persisted through http_cache so later runs skip the request
+    until the TTL expires.
+
+    :param force_refresh: Ignore the in-memory copy and revalidate with a zero TTL
+    :param ttl: Maximum age of the on-disk copy in seconds
+    :return: List of team dicts, or None if the API call failed
+    """
+    global _teams, _team_id_map
+
+    if _teams is not None and not force_refresh:
+        return _teams
+
+    response = http_cache.get(f"{BASE_URL}/team", ttl=0 if force_refresh else ttl)
+    if response.status_code != 200:
+        print("Error fetching team data.")
+        return None
+
+    _teams = response.json().get("data", [])
+    _team_id_map = {team["id"]: team["fullName"] for team in _teams}
+    return _teams
+
+
+# Function to seed the in-memory team list, e.g. in a worker process, so no
+# request or cache lookup is needed
+def set_teams(teams):
+    global _teams, _team_id_map
+    _teams = teams
+    _team_id_map = {team["id"]: team["fullName"] for team in teams}
+
+
+# Function to build a mapping of teamId -> fullName
+def get_team_id_map():
+    if load_teams() is None:
+        return None
+    return _team_id_map
+
+
+# Function to look up a team ID from its full name
+def get_team_id_by_name(full_name):
+    teams = load_teams()
+    if teams is None:
+        return None
+    for team in teams:
+        if team["fullName"] == full_name:
+            return team["id"]
+    return None
+
+
+# Function to look up a full team name from its ID
+@tracing.traced("resolve.team_name")
+def get_team_name(team_id):
+    team_id_map = get_team_id_map()
+    if team_id_map is None:
+        return None
+    return team_id_map.get(team_id, f"Unknown Team ({team_id})")
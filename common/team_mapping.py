@@ -0,0 +1,343 @@
+# Arena location and time zone for every NHL club, keyed by full team name
+nhl_team_mapping = {
+    "Anaheim Ducks": {
+        "city": "Anaheim",
+        "coordinates": (33.8353, -117.9145),
+        "time_zone": "America/Los_Angeles"
+    },
+    "Boston Bruins": {
+        "city": "Boston",
+        "coordinates": (42.3662, -71.0209),
+        "time_zone": "America/New_York"
+    },
+    "Buffalo Sabres": {
+        "city": "Buffalo",
+        "coordinates": (42.8750, -78.8767),
+        "time_zone": "America/New_York"
+    },
+    "Calgary Flames": {
+        "city": "Calgary",
+        "coordinates": (51.0374, -114.0620),
+        "time_zone": "America/Edmonton"
+    },
+    "Carolina Hurricanes": {
+        "city": "Raleigh",
+        "coordinates": (35.8034, -78.7222),
+        "time_zone": "America/New_York"
+    },
+    "Chicago Blackhawks": {
+        "city": "Chicago",
+        "coordinates": (41.8806, -87.6742),
+        "time_zone": "America/Chicago"
+    },
+    "Colorado Avalanche": {
+        "city": "Denver",
+        "coordinates": (39.7487, -105.0076),
+        "time_zone": "America/Denver"
+    },
+    "Columbus Blue Jackets": {
+        "city": "Columbus",
+        "coordinates": (39.9690, -83.0064),
+        "time_zone": "America/New_York"
+    },
+    "Dallas Stars": {
+        "city": "Dallas",
+        "coordinates": (32.7905, -96.8103),
+        "time_zone": "America/Chicago"
+    },
+    "Detroit Red Wings": {
+        "city": "Detroit",
+        "coordinates": (42.3252, -83.0514),
+        "time_zone": "America/Detroit"
+    },
+    "Edmonton Oilers": {
+        "city": "Edmonton",
+        "coordinates": (53.5461, -113.4938),
+        "time_zone": "America/Edmonton"
+    },
+    "Florida Panthers": {
+        "city": "Sunrise",
+        "coordinates": (26.1585, -80.3256),
+        "time_zone": "America/New_York"
+    },
+    "Los Angeles Kings": {
+        "city": "Los Angeles",
+        "coordinates": (34.0430, -118.2673),
+        "time_zone": "America/Los_Angeles"
+    },
+    "Minnesota Wild": {
+        "city": "Saint Paul",
+        "coordinates": (44.9447, -93.1011),
+        "time_zone": "America/Chicago"
+    },
+    "Montreal Canadiens": {
+        "city": "Montreal",
+        "coordinates": (45.4960, -73.5693),
+        "time_zone": "America/Montreal"
+    },
+    "Nashville Predators": {
+        "city": "Nashville",
+        "coordinates": (36.1590, -86.7787),
+        "time_zone": "America/Chicago"
+    },
+    "New Jersey Devils": {
+        "city": "Newark",
+        "coordinates": (40.7336, -74.1711),
+        "time_zone": "America/New_York"
+    },
+    "New York Islanders": {
+        "city": "Elmont",
+        "coordinates": (40.7007, -73.7080),
+        "time_zone": "America/New_York"
+    },
+    "New York Rangers": {
+        "city": "New York",
+        "coordinates": (40.7505, -73.9934),
+        "time_zone": "America/New_York"
+    },
+    "Ottawa Senators": {
+        "city": "Ottawa",
+        "coordinates": (45.2969, -75.9273),
+        "time_zone": "America/Toronto"
+    },
+    "Philadelphia Flyers": {
+        "city": "Philadelphia",
+        "coordinates": (39.9012, -75.1720),
+        "time_zone": "America/New_York"
+    },
+    "Pittsburgh Penguins": {
+        "city": "Pittsburgh",
+        "coordinates": (40.4394, -79.9893),
+        "time_zone": "America/New_York"
+    },
+    "San Jose Sharks": {
+        "city": "San Jose",
+        "coordinates": (37.3329, -121.9012),
+        "time_zone": "America/Los_Angeles"
+    },
+    "Seattle Kraken": {
+        "city": "Seattle",
+        "coordinates": (47.6221, -122.3541),
+        "time_zone": "America/Los_Angeles"
+    },
+    "St. Louis Blues": {
+        "city": "St. Louis",
+        "coordinates": (38.6266, -90.2026),
+        "time_zone": "America/Chicago"
+    },
+    "Tampa Bay Lightning": {
+        "city": "Tampa",
+        "coordinates": (27.9428, -82.4519),
+        "time_zone": "America/New_York"
+    },
+    "Toronto Maple Leafs": {
+        "city": "Toronto",
+        "coordinates": (43.6435, -79.3791),
+        "time_zone": "America/Toronto"
+    },
+    "Vancouver Canucks": {
+        "city": "Vancouver",
+        "coordinates": (49.2778, -123.1088),
+        "time_zone": "America/Vancouver"
+    },
+    "Utah Mammoth": {
+        "city": "Salt Lake City",
+        "coordinates": (40.7683, -111.9011),
+        "time_zone": "America/Denver"
+    },
+    "Vegas Golden Knights": {
+        "city": "Las Vegas",
+        "coordinates": (36.1029, -115.1784),
+        "time_zone": "America/Los_Angeles"
+    },
+    "Washington Capitals": {
+        "city": "Washington",
+        "coordinates": (38.8981, -77.0209),
+        "time_zone": "America/New_York"
+    },
+    "Winnipeg Jets": {
+        "city": "Winnipeg",
+        "coordinates": (49.8951, -97.1384),
+        "time_zone": "America/Winnipeg"
+    }
+}
+
+# Arena location and time zone of clubs that have since relocated, been renamed
+# or folded, so multi-decade histories still resolve their venues. These are
+# not current clubs: team lists keep coming from nhl_team_mapping.
+historical_team_mapping = {
+    "Arizona Coyotes": {
+        "city": "Tempe",
+        "coordinates": (33.4255, -111.9400),
+        "time_zone": "America/Phoenix"
+    },
+    "Atlanta Flames": {
+        "city": "Atlanta",
+        "coordinates": (33.7580, -84.3960),
+        "time_zone": "America/New_York"
+    },
+    "Atlanta Thrashers": {
+        "city": "Atlanta",
+        "coordinates": (33.7573, -84.3963),
+        "time_zone": "America/New_York"
+    },
+    "Brooklyn Americans": {
+        "city": "New York",
+        "coordinates": (40.7505, -73.9934),
+        "time_zone": "America/New_York"
+    },
+    "California Golden Seals": {
+        "city": "Oakland",
+        "coordinates": (37.7503, -122.2030),
+        "time_zone": "America/Los_Angeles"
+    },
+    "Cleveland Barons": {
+        "city": "Richfield",
+        "coordinates": (41.2381, -81.5869),
+        "time_zone": "America/New_York"
+    },
+    "Colorado Rockies": {
+        "city": "Denver",
+        "coordinates": (39.7424, -105.0210),
+        "time_zone": "America/Denver"
+    },
+    "Detroit Cougars": {
+        "city": "Detroit",
+        "coordinates": (42.3440, -83.0700),
+        "time_zone": "America/Detroit"
+    },
+    "Detroit Falcons": {
+        "city": "Detroit",
+        "coordinates": (42.3440, -83.0700),
+        "time_zone": "America/Detroit"
+    },
+    "Hamilton Tigers": {
+        "city": "Hamilton",
+        "coordinates": (43.2557, -79.8481),
+        "time_zone": "America/Toronto"
+    },
+    "Hartford Whalers": {
+        "city": "Hartford",
+        "coordinates": (41.7685, -72.6770),
+        "time_zone": "America/New_York"
+    },
+    "Kansas City Scouts": {
+        "city": "Kansas City",
+        "coordinates": (39.0963, -94.6055),
+        "time_zone": "America/Chicago"
+    },
+    "Mighty Ducks of Anaheim": {
+        "city": "Anaheim",
+        "coordinates": (33.8078, -117.8765),
+        "time_zone": "America/Los_Angeles"
+    },
+    "Minnesota North Stars": {
+        "city": "Bloomington",
+        "coordinates": (44.8547, -93.2424),
+        "time_zone": "America/Chicago"
+    },
+    "Montreal Maroons": {
+        "city": "Montreal",
+        "coordinates": (45.4898, -73.5866),
+        "time_zone": "America/Toronto"
+    },
+    "Montreal Wanderers": {
+        "city": "Montreal",
+        "coordinates": (45.4898, -73.5866),
+        "time_zone": "America/Toronto"
+    },
+    "New York Americans": {
+        "city": "New York",
+        "coordinates": (40.7505, -73.9934),
+        "time_zone": "America/New_York"
+    },
+    "Oakland Seals": {
+        "city": "Oakland",
+        "coordinates": (37.7503, -122.2030),
+        "time_zone": "America/Los_Angeles"
+    },
+    "Ottawa Senators (1917)": {
+        "city": "Ottawa",
+        "coordinates": (45.4170, -75.6900),
+        "time_zone": "America/Toronto"
+    },
+    "Philadelphia Quakers": {
+        "city": "Philadelphia",
+        "coordinates": (39.9570, -75.2030),
+        "time_zone": "America/New_York"
+    },
+    "Phoenix Coyotes": {
+        "city": "Glendale",
+        "coordinates": (33.5319, -112.2611),
+        "time_zone": "America/Phoenix"
+    },
+    "Pittsburgh Pirates": {
+        "city": "Pittsburgh",
+        "coordinates": (40.4470, -79.9540),
+        "time_zone": "America/New_York"
+    },
+    "Quebec Bulldogs": {
+        "city": "Quebec City",
+        "coordinates": (46.8139, -71.2080),
+        "time_zone": "America/Toronto"
+    },
+    "Quebec Nordiques": {
+        "city": "Quebec City",
+        "coordinates": (46.8297, -71.2486),
+        "time_zone": "America/Toronto"
+    },
+    "St. Louis Eagles": {
+        "city": "St. Louis",
+        "coordinates": (38.6310, -90.2850),
+        "time_zone": "America/Chicago"
+    },
+    "Toronto Arenas": {
+        "city": "Toronto",
+        "coordinates": (43.6585, -79.3870),
+        "time_zone": "America/Toronto"
+    },
+    "Toronto St. Patricks": {
+        "city": "Toronto",
+        "coordinates": (43.6585, -79.3870),
+        "time_zone": "America/Toronto"
+    },
+    "Utah Hockey Club": {
+        "city": "Salt Lake City",
+        "coordinates": (40.7683, -111.9011),
+        "time_zone": "America/Denver"
+    },
+    "Winnipeg Jets (1979)": {
+        "city": "Winnipeg",
+        "coordinates": (49.8890, -97.2360),
+        "time_zone": "America/Winnipeg"
+    }
+}
+
+# Every known venue, current and historical, keyed by full team name
+nhl_venue_mapping = {**historical_team_mapping, **nhl_team_mapping}
+
+# Conference of every club under the current alignment, then the former clubs in
+# the venue mapping: 1974-1993 clubs by the conference they played in (Wales is
+# Eastern, Campbell is Western), earlier ones by division or geography
+nhl_conferences = {
+    "Eastern": [
+        "Boston Bruins", "Buffalo Sabres", "Carolina Hurricanes", "Columbus Blue Jackets",
+        "Detroit Red Wings", "Florida Panthers", "Montreal Canadiens", "New Jersey Devils",
+        "New York Islanders", "New York Rangers", "Ottawa Senators", "Philadelphia Flyers",
+        "Pittsburgh Penguins", "Tampa Bay Lightning", "Toronto Maple Leafs", "Washington Capitals",
+        "Atlanta Thrashers", "Brooklyn Americans", "Cleveland Barons", "Detroit Cougars",
+        "Detroit Falcons", "Hamilton Tigers", "Hartford Whalers", "Montreal Maroons",
+        "Montreal Wanderers", "New York Americans", "Ottawa Senators (1917)", "Philadelphia Quakers",
+        "Pittsburgh Pirates", "Quebec Bulldogs", "Quebec Nordiques", "Toronto Arenas",
+        "Toronto St. Patricks",
+    ],
+    "Western": [
+        "Anaheim Ducks", "Calgary Flames", "Chicago Blackhawks", "Colorado Avalanche",
+        "Dallas Stars", "Edmonton Oilers", "Los Angeles Kings", "Minnesota Wild",
+        "Nashville Predators", "San Jose Sharks", "Seattle Kraken", "St. Louis Blues",
+        "Utah Mammoth", "Vancouver Canucks", "Vegas Golden Knights", "Winnipeg Jets",
+        "Arizona Coyotes", "Atlanta Flames", "California Golden Seals", "Colorado Rockies",
+        "Kansas City Scouts", "Mighty Ducks of Anaheim", "Minnesota North Stars", "Oakland Seals",
+        "Phoenix Coyotes", "St. Louis Eagles", "Utah Hockey Club", "Winnipeg Jets (1979)",
+    ],
+}
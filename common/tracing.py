@@ -0,0 +1,235 @@
+import functools
+import io
+import json
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+# Upper bounds (milliseconds) of the request latency histogram buckets
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# Off by default; every hook below reduces to one flag check until enable() is called
+enabled = False
+
+_lock = threading.Lock()
+_stages = {}
+_counters = {}
+_requests = {}
+_started_at = None
+_profilers = []
+_NOOP = nullcontext()
+
+
+def enable(profile=False, memory=False):
+    """
+    Turns tracing on for the rest of the run.
+
+    :param profile: Also run cProfile, on the calling thread and on every
+        thread started afterwards (the fetch worker pool)
+    :param memory: Also track allocations with tracemalloc
+    """
+    global enabled, _started_at
+    reset()
+    _started_at = time.perf_counter()
+    enabled = True
+
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        _profilers.append(profiler)
+        profiler.enable()
+        # From 3.12 cProfile uses sys.monitoring: one profiler sees every thread,
+        # and a second one in the same process fails to start
+        if sys.version_info < (3, 12):
+            threading.setprofile(_profile_thread)
+    if memory:
+        import tracemalloc
+        tracemalloc.start(10)
+
+
+# Function to give each new thread its own profiler (cProfile is per thread before 3.12)
+def _profile_thread(frame, event, arg):
+    import cProfile
+    profiler = cProfile.Profile()
+    with _lock:
+        _profilers.append(profiler)
+    profiler.enable()
+
+
+# Function to forget everything recorded so far
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+        _requests.clear()
+
+
+# Function to add seconds to a stage's totals
+def _add(name, seconds):
+    with _lock:
+        totals = _stages.get(name)
+        if totals is None:
+            _stages[name] = {"calls": 1, "seconds": seconds, "max_seconds": seconds}
+        else:
+            totals["calls"] += 1
+            totals["seconds"] += seconds
+            if seconds > totals["max_seconds"]:
+                totals["max_seconds"] = seconds
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        _add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def stage(name):
+    """
+    Context manager timing a block as one call of the named stage, e.g.
+    `with tracing.stage("write.csv"): ...`. Stage times are wall time, so
+    concurrent calls overlap.
+
+    :param name: Stage name; dotted prefixes group related stages
+    :return: Context manager
+    """
+    return _Timer(name) if enabled else _NOOP
+
+
+def traced(name):
+    """
+    Decorator timing every call of a function as the named stage.
+
+    :param name: Stage name
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _add(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+# Function to bump a named counter (rows written, retries, ...)
+def count(name, amount=1):
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def record_request(seconds, status_code):
+    """
+    Adds one network request to the latency histogram.
+
+    :param seconds: Time from sending the request to reading the response
+    :param status_code: HTTP status of the response
+    """
+    if not enabled:
+        return
+    milliseconds = seconds * 1000
+    bucket = next((f"<={bound}ms" for bound in LATENCY_BUCKETS_MS if milliseconds <= bound),
+                  f">{LATENCY_BUCKETS_MS[-1]}ms")
+    with _lock:
+        totals = _requests.setdefault("all", {"count": 0, "seconds": 0.0, "histogram": {}, "status": {}})
+        totals["count"] += 1
+        totals["seconds"] += seconds
+        totals["histogram"][bucket] = totals["histogram"].get(bucket, 0) + 1
+        totals["status"][str(status_code)] = totals["status"].get(str(status_code), 0) + 1
+
+
+# Function to summarize the collected profiles as the slowest functions by cumulative time
+def _profile_summary(limit=25):
+    for profiler in _profilers:
+        profiler.disable()
+    threading.setprofile(None)
+    profiles = [profiler for profiler in _profilers if profiler.getstats()]
+    if not profiles:
+        return []
+
+    import pstats
+    stats = pstats.Stats(profiles[0], stream=io.StringIO())
+    for profiler in profiles[1:]:
+        stats.add(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            "function": f"{filename}:{line}({function})",
+            "calls": calls,
+            "own_seconds": own,
+            "cumulative_seconds": cumulative,
+        }
+        for (filename, line, function), (_, calls, own, cumulative, _) in rows
+    ]
+
+
+# Function to summarize current/peak traced memory and the largest allocation sites
+def _memory_summary(limit=15):
+    tracemalloc = sys.modules.get("tracemalloc")
+    if tracemalloc is None or not tracemalloc.is_tracing():
+        return None
+    current, peak = tracemalloc.get_traced_memory()
+    top = tracemalloc.take_snapshot().statistics("lineno")[:limit]
+    tracemalloc.stop()
+    return {
+        "current_mb": current / 2**20,
+        "peak_mb": peak / 2**20,
+        "top_allocations": [{"site": str(stat.traceback[0]), "mb": stat.size / 2**20, "blocks": stat.count}
+                            for stat in top],
+    }
+
+
+def report(**extra):
+    """
+    Builds the run report: per-stage totals, counters, the request latency
+    histogram and, if enabled, profile and memory summaries. Stops any
+    profiling or memory tracking.
+
+    :param extra: Additional top-level fields, e.g. cache statistics
+    :return: Dict ready for json.dump
+    """
+    with _lock:
+        stages = {name: dict(totals) for name, totals in sorted(_stages.items())}
+        counters = dict(sorted(_counters.items()))
+        requests = json.loads(json.dumps(_requests.get("all", {})))
+
+    for totals in stages.values():
+        totals["mean_seconds"] = totals["seconds"] / totals["calls"]
+
+    result = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "wall_seconds": time.perf_counter() - _started_at if _started_at else None,
+        "stages": stages,
+        "counters": counters,
+        "requests": requests,
+    }
+    result.update(extra)
+    if _profilers:
+        result["profile"] = _profile_summary()
+    memory = _memory_summary()
+    if memory:
+        result["memory"] = memory
+    return result
+
+
+# Function to write the run report as JSON
+def write_report(path, **extra):
+    with open(path, "w") as f:
+        json.dump(report(**extra), f, indent=2)
+    print(f"Trace report written to {path}")
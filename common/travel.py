@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+import tracing
+import travel_matrix
+
+TRAVEL_COLUMNS = [
+    "Distance Traveled (miles)", "Time Zone Change", "Rest Days",
+    "Back To Back", "Road Trip Game", "Road Trip Miles",
+]
+
+
+def compute_travel(df, team_name=None):
+    """
+    Adds leg-by-leg travel and rest columns to a table of games, in one
+    vectorized pass over every season (and team) at once.
+
+    Each game's leg starts at the previous game's venue, so a road trip that
+    goes city to city is measured as such, and the first home game after a
+    trip carries the flight home. The first game of a season starts from the
+    team's own arena.
+
+    :param df: DataFrame with "Season", "Game Location", "Opponent Team" and
+        "Game Date" columns, plus a "Team" column unless team_name is given
+    :param team_name: Full name of the team the rows belong to
+    :return: New DataFrame sorted by team, season and date with TRAVEL_COLUMNS filled in
+    """
+    if df.empty:
+        return df.reindex(columns=list(df.columns) + [c for c in TRAVEL_COLUMNS if c not in df.columns])
+
+    df = df.copy()
+    added_team = "Team" not in df.columns
+    if added_team:
+        df["Team"] = team_name
+
+    game_dates = pd.to_datetime(df["Game Date"].astype(str).str[:10], format="%Y-%m-%d")
+    df = df.assign(_date=game_dates).sort_values(["Team", "Season", "_date"], kind="stable")
+    df = df.reset_index(drop=True)
+
+    is_home = (df["Game Location"] == "Home").to_numpy()
+    team_idx = travel_matrix.team_indices(df["Team"].to_numpy())
+    opponent_idx = travel_matrix.team_indices(df["Opponent Team"].to_numpy())
+    venue_idx = np.where(is_home, team_idx, opponent_idx)
+
+    # A row starts a new sequence when the team or season changes
+    group = df["Team"].ne(df["Team"].shift()) | df["Season"].ne(df["Season"].shift())
+    new_group = group.to_numpy()
+
+    previous_venue = np.roll(venue_idx, 1)
+    previous_venue[new_group] = team_idx[new_group]
+
+    with tracing.stage("travel.distance"):
+        legs = travel_matrix.distance_matrix()[previous_venue, venue_idx]
+    with tracing.stage("travel.time_zone"):
+        tz_changes = travel_matrix.time_zone_changes_by_index(previous_venue, venue_idx, df["_date"].to_numpy())
+
+    day_numbers = df["_date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    rest_days = np.diff(day_numbers, prepend=day_numbers[0])
+    rest_days[new_group] = 0
+
+    # Road trips: consecutive away games; a home game (or new season) ends the trip
+    trip_break = is_home | new_group
+    trip_id = np.cumsum(trip_break)
+    away = pd.Series(np.where(is_home, 0, 1))
+    trip_game = away.groupby(trip_id).cumsum().to_numpy()
+    trip_miles = pd.Series(np.where(is_home, 0.0, legs)).groupby(trip_id).cumsum().to_numpy()
+
+    df["Distance Traveled (miles)"] = legs
+    df["Time Zone Change"] = tz_changes
+    df["Rest Days"] = rest_days
+    df["Back To Back"] = (rest_days == 1) & ~new_group
+    df["Road Trip Game"] = trip_game
+    df["Road Trip Miles"] = trip_miles
+    return df.drop(columns=["_date", "Team"] if added_team else "_date")
@@ -0,0 +1,251 @@
+import os
+import threading
+import uuid
+from datetime import date, datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from settings import CACHE_DIR
+from team_mapping import nhl_venue_mapping
+
+# Row/column order of the matrices, covering current and historical clubs;
+# the extra last slot stands in for any team with no known venue. Every
+# distance and time zone change involving it is NaN rather than a made-up
+# number, so one unknown venue cannot pass as a 7,000-mile leg.
+TEAM_NAMES = list(nhl_venue_mapping)
+UNKNOWN = len(TEAM_NAMES)
+TEAM_INDEX = {name: i for i, name in enumerate(TEAM_NAMES)}
+
+COORDINATES = np.array(
+    [nhl_venue_mapping[name]["coordinates"] for name in TEAM_NAMES] + [(0.0, 0.0)],
+    dtype=np.float64,
+)
+# The unknown slot needs some zone to index the offset table; its results are masked
+TIME_ZONES = [nhl_venue_mapping[name]["time_zone"] for name in TEAM_NAMES] + ["UTC"]
+
+# Time zone names interned to small integer codes; TEAM_TZ_CODE[team index] is
+# the code of that arena's zone and a row of the offset table
+TZ_NAMES = sorted(set(TIME_ZONES))
+TZ_CODE = {name: code for code, name in enumerate(TZ_NAMES)}
+TEAM_TZ_CODE = np.array([TZ_CODE[name] for name in TIME_ZONES], dtype=np.int8)
+
+# Day range covered by the offset table: all of NHL expansion-era history plus
+# every schedule we could plausibly be asked to project
+OFFSET_TABLE_START = date(1960, 1, 1)
+OFFSET_TABLE_END = date(2050, 12, 31)
+_EPOCH_START_DAY = (OFFSET_TABLE_START - date(1970, 1, 1)).days
+
+DISTANCE_CACHE_FILE = os.path.join(CACHE_DIR, "distance_matrix.npz")
+OFFSET_CACHE_FILE = os.path.join(CACHE_DIR, "utc_offset_table.npz")
+
+
+# Function to compute every arena-to-arena geodesic distance in miles
+def _build_distance_matrix(coordinates):
+    from geopy.distance import geodesic
+
+    n = len(coordinates)
+    matrix = np.zeros((n, n), dtype=np.float64)
+    for i in range(n):
+        for j in range(i + 1, n):
+            matrix[i, j] = matrix[j, i] = geodesic(coordinates[i], coordinates[j]).miles
+    matrix[UNKNOWN, :] = matrix[:, UNKNOWN] = np.nan
+    return matrix
+
+
+def load_distance_matrix():
+    """
+    Returns the (n+1)x(n+1) arena distance matrix in miles.
+
+    The matrix is read from DISTANCE_CACHE_FILE when it was built from the
+    same coordinates, and rebuilt (and re-saved) otherwise.
+    """
+    try:
+        cached = np.load(DISTANCE_CACHE_FILE)
+        if np.array_equal(cached["coordinates"], COORDINATES):
+            return cached["miles"]
+    except (OSError, KeyError, ValueError):
+        pass
+
+    matrix = _build_distance_matrix(COORDINATES)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Unique per writer, so processes building the matrix at once do not collide
+    tmp_file = f"{DISTANCE_CACHE_FILE}.{uuid.uuid4().hex}.tmp.npz"
+    np.savez(tmp_file, coordinates=COORDINATES, miles=matrix)
+    os.replace(tmp_file, DISTANCE_CACHE_FILE)
+    return matrix
+
+
+_distance_matrix = None
+_distance_lock = threading.Lock()
+
+
+# Function to get the distance matrix, loading it on first use (once, even
+# when several season threads ask for it at the same time)
+def distance_matrix():
+    global _distance_matrix
+    if _distance_matrix is None:
+        with _distance_lock:
+            if _distance_matrix is None:
+                _distance_matrix = load_distance_matrix()
+    return _distance_matrix
+
+
+# Function to map team names to matrix indices
+def team_indices(team_names):
+    return np.fromiter(
+        (TEAM_INDEX.get(name, UNKNOWN) for name in team_names), dtype=np.intp, count=len(team_names)
+    )
+
+
+def distance(from_team, to_team):
+    """
+    Arena-to-arena distance in miles between two teams.
+
+    :param from_team: Full team name of the starting arena
+    :param to_team: Full team name of the destination arena
+    :return: Distance in miles, NaN if either venue is unknown
+    """
+    return float(distance_matrix()[TEAM_INDEX.get(from_team, UNKNOWN), TEAM_INDEX.get(to_team, UNKNOWN)])
+
+
+def distances(from_teams, to_teams):
+    """
+    Vectorized distance() over whole columns of team names.
+
+    :param from_teams: Sequence of full team names
+    :param to_teams: Sequence of full team names, same length
+    :return: NumPy array of distances in miles
+    """
+    return distance_matrix()[team_indices(from_teams), team_indices(to_teams)]
+
+
+@lru_cache(maxsize=None)
+def utc_offset_hours(time_zone, game_date):
+    """
+    UTC offset of a time zone at local noon on the game date, so the DST
+    state is the one in effect when the game was played. Used to build the
+    offset table and for dates outside it.
+
+    :param time_zone: IANA time zone name, e.g. "America/Vancouver"
+    :param game_date: Date in "YYYY-MM-DD" format
+    :return: Offset in hours
+    """
+    day = date.fromisoformat(str(game_date)[:10])
+    local_noon = datetime(day.year, day.month, day.day, 12, tzinfo=ZoneInfo(time_zone))
+    return local_noon.utcoffset().total_seconds() / 3600
+
+
+# Function to compute the UTC offset of every interned zone on every day of the table
+def _build_offset_table():
+    days = (OFFSET_TABLE_END - OFFSET_TABLE_START).days + 1
+    table = np.empty((len(TZ_NAMES), days), dtype=np.float32)
+    for code, name in enumerate(TZ_NAMES):
+        zone = ZoneInfo(name)
+        day = OFFSET_TABLE_START
+        for i in range(days):
+            local_noon = datetime(day.year, day.month, day.day, 12, tzinfo=zone)
+            table[code, i] = local_noon.utcoffset().total_seconds() / 3600
+            day = date.fromordinal(day.toordinal() + 1)
+    return table
+
+
+def load_offset_table():
+    """
+    Returns the (time zone code x day) table of UTC offsets in hours, read
+    from OFFSET_CACHE_FILE when it covers the same zones and day range and
+    rebuilt (and re-saved) otherwise.
+    """
+    key = np.array(TZ_NAMES + [OFFSET_TABLE_START.isoformat(), OFFSET_TABLE_END.isoformat()])
+    try:
+        cached = np.load(OFFSET_CACHE_FILE)
+        if np.array_equal(cached["key"], key):
+            return cached["offsets"]
+    except (OSError, KeyError, ValueError):
+        pass
+
+    table = _build_offset_table()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_file = f"{OFFSET_CACHE_FILE}.{uuid.uuid4().hex}.tmp.npz"
+    np.savez(tmp_file, key=key, offsets=table)
+    os.replace(tmp_file, OFFSET_CACHE_FILE)
+    return table
+
+
+_offset_table = None
+_offset_lock = threading.Lock()
+
+
+# Function to get the offset table, loading it on first use (once, even when
+# several season threads ask for it at the same time)
+def offset_table():
+    global _offset_table
+    if _offset_table is None:
+        with _offset_lock:
+            if _offset_table is None:
+                _offset_table = load_offset_table()
+    return _offset_table
+
+
+# Function to convert game dates (strings or datetime64) to offset table columns
+def day_indices(game_dates):
+    dates = np.asarray(game_dates)
+    if dates.dtype.kind != "M":
+        dates = dates.astype("U10")
+    return dates.astype("datetime64[D]").astype(np.int64) - _EPOCH_START_DAY
+
+
+def time_zone_change(from_team, to_team, game_date):
+    """
+    Hours the clock shifts travelling from one team's arena to another's.
+
+    :param from_team: Full team name of the starting arena
+    :param to_team: Full team name of the destination arena
+    :param game_date: Date in "YYYY-MM-DD" format
+    :return: Difference in UTC offsets (destination minus origin) in hours, NaN if either venue is unknown
+    """
+    from_idx = np.array([TEAM_INDEX.get(from_team, UNKNOWN)])
+    to_idx = np.array([TEAM_INDEX.get(to_team, UNKNOWN)])
+    return float(time_zone_changes_by_index(from_idx, to_idx, [game_date])[0])
+
+
+def time_zone_changes(from_teams, to_teams, game_dates):
+    """
+    Vectorized time_zone_change() over whole columns of team names.
+
+    :param from_teams: Sequence of full team names
+    :param to_teams: Sequence of full team names
+    :param game_dates: Sequence of dates in "YYYY-MM-DD" format
+    :return: NumPy array of time zone changes in hours
+    """
+    return time_zone_changes_by_index(team_indices(from_teams), team_indices(to_teams), game_dates)
+
+
+def time_zone_changes_by_index(from_idx, to_idx, game_dates):
+    """
+    time_zone_changes() for callers that already hold matrix indices. Each
+    row is two lookups into the (time zone code x day) offset table; dates
+    outside the table fall back to utc_offset_hours().
+
+    :param from_idx: NumPy array of matrix indices
+    :param to_idx: NumPy array of matrix indices
+    :param game_dates: Sequence of dates in "YYYY-MM-DD" format (or datetime64)
+    :return: NumPy array of time zone changes in hours
+    """
+    table = offset_table()
+    from_code = TEAM_TZ_CODE[from_idx]
+    to_code = TEAM_TZ_CODE[to_idx]
+    day_idx = day_indices(game_dates)
+
+    in_range = (day_idx >= 0) & (day_idx < table.shape[1])
+    safe_idx = np.where(in_range, day_idx, 0)
+    changes = (table[to_code, safe_idx] - table[from_code, safe_idx]).astype(np.float64)
+
+    for i in np.flatnonzero(~in_range):
+        game_date = str(np.datetime64(int(day_idx[i]) + _EPOCH_START_DAY, "D"))
+        changes[i] = (
+            utc_offset_hours(TZ_NAMES[to_code[i]], game_date) - utc_offset_hours(TZ_NAMES[from_code[i]], game_date)
+        )
+    changes[(np.asarray(from_idx) == UNKNOWN) | (np.asarray(to_idx) == UNKNOWN)] = np.nan
+    return changes
@@ -1,8 +1,29 @@
-import pandas as pd
+import argparse
+import glob
+import os
+import sys
 import unicodedata
 
-# Load the dataset
-df = pd.read_csv('../CleanedCanucksData(1).csv')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from lazy import lazy_import
+from team_mapping import nhl_venue_mapping
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+HOME_CITY = "Vancouver"
+HOME_TEAM = "Vancouver Canucks"
+
+COORDINATE_COLUMNS = ["From (Latitude)", "From (Longitude)", "To (Latitude)", "To (Longitude)"]
+
+# Columns enrich() writes; "City" is already in canucks-iterate.py output
+ENRICHED_COLUMNS = ["City", "State/Province", "City_Latitude", "City_Longitude"]
+
+# Per-season outputs of canucks-iterate.py, the default input of --stream
+SEASON_PATTERN = "../iterative-seasons/canucks_game_history_*.csv"
+
+# Rows held in memory at once in --stream mode
+CHUNK_ROWS = 50_000
 
 # Normalize function to remove accents
 def normalize_city_name(name):
@@ -41,6 +62,7 @@ city_to_state = {
     "St. Louis": "Missouri",
     "Tampa Bay": "Florida",
     "Toronto": "Ontario",
+    "Utah": "Utah",
     "Vancouver": "British Columbia",
     "Vegas": "Nevada",
     "Washington": "District of Columbia",
@@ -61,30 +83,164 @@ def extract_city(team_name):
         return two_words
     return words[0]
 
-# Apply to create City column
-df['City'] = df.apply(
-    lambda row: "Vancouver" if row["Game Location"] == "Home" else extract_city(row["Opponent Team"]),
-    axis=1
-)
+# Function to build the team -> city -> state lookup once per distinct team name
+def build_team_lookup(team_names):
+    teams = pd.Index(pd.unique(team_names))
+    cities = [extract_city(name) for name in teams]
+    states = [city_to_state.get(normalize_city_name(city)) for city in cities]
+    return pd.DataFrame({"City": cities, "State/Province": states}, index=teams)
+
+def enrich(df):
+    """
+    Adds City, State/Province, City_Latitude and City_Longitude for each
+    game's venue using whole-column operations. City parsing and accent
+    normalization run once per distinct team, not once per row.
+
+    :param df: DataFrame with "Game Location", "Opponent Team" and From/To
+        coordinate columns, plus "Team" for league-wide data
+    :return: The same DataFrame with the four columns added
+    """
+    is_home = (df["Game Location"] == "Home").to_numpy()
+    lookup = build_team_lookup(df["Opponent Team"])
+    opponent_city = df["Opponent Team"].map(lookup["City"]).to_numpy(dtype=object)
+    opponent_state = df["Opponent Team"].map(lookup["State/Province"]).to_numpy(dtype=object)
+
+    # League-wide datasets carry a "Team" column; otherwise every home game is in Vancouver
+    if "Team" in df.columns:
+        team_lookup = build_team_lookup(df["Team"])
+        home_city = df["Team"].map(team_lookup["City"]).to_numpy(dtype=object)
+        home_state = df["Team"].map(team_lookup["State/Province"]).to_numpy(dtype=object)
+    else:
+        home_city = HOME_CITY
+        home_state = city_to_state[normalize_city_name(HOME_CITY)]
+
+    df["City"] = np.where(is_home, home_city, opponent_city)
+    df["State/Province"] = np.where(is_home, home_state, opponent_state)
+
+    # Coordinates
+    df["City_Latitude"] = np.where(is_home, df["From (Latitude)"], df["To (Latitude)"])
+    df["City_Longitude"] = np.where(is_home, df["From (Longitude)"], df["To (Longitude)"])
+    return df
+
+# Function to add arena coordinates to rows that lack them (the per-season CSVs
+# carry only team names); "From" is the team's own arena, "To" the opponent's
+def add_coordinates(df):
+    if all(column in df.columns for column in COORDINATE_COLUMNS):
+        return df
+    latitudes = {name: info["coordinates"][0] for name, info in nhl_venue_mapping.items()}
+    longitudes = {name: info["coordinates"][1] for name, info in nhl_venue_mapping.items()}
+    home_team = df["Team"] if "Team" in df.columns else pd.Series(HOME_TEAM, index=df.index)
+    df["From (Latitude)"] = home_team.map(latitudes)
+    df["From (Longitude)"] = home_team.map(longitudes)
+    df["To (Latitude)"] = df["Opponent Team"].map(latitudes)
+    df["To (Longitude)"] = df["Opponent Team"].map(longitudes)
+    return df
+
+# Function to load a merged CSV or a Parquet dataset, with every column so the
+# enriched output keeps results, goals and travel alongside the venue columns
+def load_games(path):
+    if path.endswith(".parquet") or os.path.isdir(path):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+# Function to save the enriched dataset as CSV or Parquet
+def save_games(df, path):
+    if path.endswith(".parquet"):
+        df = df.astype({"City": "category", "State/Province": "category"})
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+# Function to list the columns of every input without reading any rows
+def input_columns(paths):
+    columns = []
+    for path in paths:
+        if path.endswith(".csv"):
+            names = pd.read_csv(path, nrows=0).columns
+        else:
+            import pyarrow.dataset as ds
+            names = ds.dataset(path, format="parquet", partitioning="hive").schema.names
+        columns += [name for name in names if name not in columns]
+    return columns
+
+# Function to read the inputs as a stream of DataFrames of at most chunk_rows rows
+def iter_chunks(paths, chunk_rows=CHUNK_ROWS):
+    for path in paths:
+        if path.endswith(".csv"):
+            yield from pd.read_csv(path, chunksize=chunk_rows)
+        else:
+            import pyarrow.dataset as ds
+            dataset = ds.dataset(path, format="parquet", partitioning="hive")
+            for batch in dataset.to_batches(batch_size=chunk_rows):
+                yield batch.to_pandas()
+
+def stream_enrich(paths, output, chunk_rows=CHUNK_ROWS):
+    """
+    Enriches many season files chunk by chunk, appending each chunk to the
+    output as soon as it is done, so memory use depends on chunk_rows and not
+    on the number of seasons or teams. Every chunk is aligned to the union of
+    the input columns. The output is written to a temporary file and moved
+    into place at the end.
+
+    :param paths: CSV files, Parquet files or Parquet dataset directories
+    :param output: Output .csv or .parquet path
+    :param chunk_rows: Rows per chunk
+    :return: Number of rows written
+    """
+    columns = input_columns(paths)
+    columns += [column for column in COORDINATE_COLUMNS + ENRICHED_COLUMNS if column not in columns]
+
+    tmp_file = f"{output}.tmp"
+    writer = None
+    rows = 0
+    try:
+        for chunk in iter_chunks(paths, chunk_rows):
+            chunk = enrich(add_coordinates(chunk)).reindex(columns=columns)
+            if output.endswith(".parquet"):
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                if writer is None:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    writer = pq.ParquetWriter(tmp_file, table.schema)
+                else:
+                    table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(tmp_file, mode="a" if rows else "w", header=not rows, index=False)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if rows:
+        os.replace(tmp_file, output)
+    return rows
 
-# Normalize city names before lookup
-df['Normalized_City'] = df['City'].apply(normalize_city_name)
+def main():
+    parser = argparse.ArgumentParser(description="Add city, state/province and coordinates of each game's venue.")
+    parser.add_argument("input", nargs="*", help="Merged CSV or Parquet dataset (with --stream: files, directories or glob patterns)")
+    parser.add_argument("--output", default="../Updated_CanucksData.csv", help="Output .csv or .parquet path")
+    parser.add_argument("--stream", action="store_true", help=f"Enrich per-season files in chunks (default input: {SEASON_PATTERN})")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows per chunk in --stream mode")
+    args = parser.parse_args()
 
-# Map to state/province
-df['State/Province'] = df['Normalized_City'].map(city_to_state)
+    if args.stream:
+        paths = sorted(path for pattern in (args.input or [SEASON_PATTERN]) for path in glob.glob(pattern))
+        if not paths:
+            print("No input files found.")
+            return
+        rows = stream_enrich(paths, args.output, args.chunk_rows)
+        print(f"Enriched {rows} games from {len(paths)} files into {args.output}")
+        return
 
-# Coordinates
-df["City_Latitude"] = df.apply(
-    lambda row: row["From (Latitude)"] if row["Game Location"] == "Home" else row["To (Latitude)"], axis=1
-)
+    # Load the dataset
+    df = load_games(args.input[0] if args.input else "../CleanedCanucksData(1).csv")
 
-df["City_Longitude"] = df.apply(
-    lambda row: row["From (Longitude)"] if row["Game Location"] == "Home" else row["To (Longitude)"], axis=1
-)
+    # Save cleaned dataset
+    df = enrich(add_coordinates(df))
+    save_games(df, args.output)
 
-# Save cleaned dataset
-df.drop(columns=["Normalized_City"], inplace=True)
-df.to_csv("../Updated_CanucksData.csv", index=False)
+    # Preview
+    print(df[["Opponent Team", "Game Location", "City", "State/Province"]].head(10))
 
-# Preview
-print(df[["Opponent Team", "Game Location", "City", "State/Province"]].head(10))
+if __name__ == "__main__":
+    main()
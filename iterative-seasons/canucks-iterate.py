@@ -1,33 +1,55 @@
-import requests
+import argparse
 import json
 import csv
-import time
+import os
+import sys
+import tempfile
 import urllib.parse
-from geopy.distance import geodesic
-from datetime import datetime
-import pytz
-
-BASE_URL = "https://api.nhle.com/stats/rest/en"
+from datetime import date, timedelta
+from functools import partial
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+import boxscore
+import fetch_engine
+import http_cache
+import pagination
+import seasons
+import settings
+import sync_state
+import team_directory
+import tracing
+from lazy import lazy_import
+from team_mapping import nhl_venue_mapping
+
+# pandas, NumPy and the modules built on them load on first use, after the
+# arguments are parsed, so --help and argument errors come back at once
+pd = lazy_import("pandas")
+game_record = lazy_import("game_record")
+league = lazy_import("league")
+pipeline = lazy_import("pipeline")
+play_by_play = lazy_import("play_by_play")
+shift_charts = lazy_import("shift_charts")
+storage = lazy_import("storage")
+travel = lazy_import("travel")
+travel_matrix = lazy_import("travel_matrix")
+
+BASE_URL = http_cache.BASE_URL
 TEAM_NAME = "Vancouver Canucks"
+# gameStateId of a game that has been played to the end
+FINAL_GAME_STATE = 7
 
 # Function to get team ID
 def get_team_id():
-    response = requests.get(f"{BASE_URL}/team")
-    if response.status_code == 200:
-        teams = response.json().get("data", [])
-        for team in teams:
-            if team["fullName"] == TEAM_NAME:
-                return team["id"]
-    print("Error fetching team data.")
-    return None
+    team_id = team_directory.get_team_id_by_name(TEAM_NAME)
+    if team_id is None:
+        print("Error fetching team data.")
+    return team_id
 
 # Function to convert team IDs to full team names
+@tracing.traced("resolve.team_names")
 def convert_id_to_team_name(file):
-    response = requests.get(f"{BASE_URL}/team")
-    if response.status_code == 200:
-        teams = response.json().get("data", [])
-        team_id_map = {team["id"]: team["fullName"] for team in teams}
-        
+    team_id_map = team_directory.get_team_id_map()
+    if team_id_map is not None:
         for game in file:
             team_id = game["Opponent Team"]
             game["Opponent Team"] = team_id_map.get(team_id, f"Unknown Team ({team_id})")
@@ -43,301 +65,395 @@ def get_season_id(start_year):
     return f"{start_year}-{end_year}"
 
 # Function to get game history for a given team in a season
+@tracing.traced("fetch.game_history")
 def get_game_history(team_id, start_date, end_date):
     query = f"(homeTeamId={team_id} or visitingTeamId={team_id}) and gameDate>='{start_date}' and gameDate<='{end_date}'"
     encoded_query = urllib.parse.quote(query)
     url = f"{BASE_URL}/game?cayenneExp={encoded_query}"
 
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json().get("data", [])
-    
-    print(f"Error fetching game history for {start_date} - {end_date}")
-    return []
-
-nhl_team_mapping = {
-    "Anaheim Ducks": {
-        "city": "Anaheim",
-        "coordinates": (33.8353, -117.9145),
-        "time_zone": "America/Los_Angeles"
-    },
-    "Arizona Coyotes": {
-        "city": "Tempe",
-        "coordinates": (33.4255, -111.9400),
-        "time_zone": "America/Phoenix"
-    },
-    "Boston Bruins": {
-        "city": "Boston",
-        "coordinates": (42.3662, -71.0209),
-        "time_zone": "America/New_York"
-    },
-    "Buffalo Sabres": {
-        "city": "Buffalo",
-        "coordinates": (42.8750, -78.8767),
-        "time_zone": "America/New_York"
-    },
-    "Calgary Flames": {
-        "city": "Calgary",
-        "coordinates": (51.0374, -114.0620),
-        "time_zone": "America/Edmonton"
-    },
-    "Carolina Hurricanes": {
-        "city": "Raleigh",
-        "coordinates": (35.8034, -78.7222),
-        "time_zone": "America/New_York"
-    },
-    "Chicago Blackhawks": {
-        "city": "Chicago",
-        "coordinates": (41.8806, -87.6742),
-        "time_zone": "America/Chicago"
-    },
-    "Colorado Avalanche": {
-        "city": "Denver",
-        "coordinates": (39.7487, -105.0076),
-        "time_zone": "America/Denver"
-    },
-    "Columbus Blue Jackets": {
-        "city": "Columbus",
-        "coordinates": (39.9690, -83.0064),
-        "time_zone": "America/New_York"
-    },
-    "Dallas Stars": {
-        "city": "Dallas",
-        "coordinates": (32.7905, -96.8103),
-        "time_zone": "America/Chicago"
-    },
-    "Detroit Red Wings": {
-        "city": "Detroit",
-        "coordinates": (42.3252, -83.0514),
-        "time_zone": "America/Detroit"
-    },
-    "Edmonton Oilers": {
-        "city": "Edmonton",
-        "coordinates": (53.5461, -113.4938),
-        "time_zone": "America/Edmonton"
-    },
-    "Florida Panthers": {
-        "city": "Sunrise",
-        "coordinates": (26.1585, -80.3256),
-        "time_zone": "America/New_York"
-    },
-    "Los Angeles Kings": {
-        "city": "Los Angeles",
-        "coordinates": (34.0430, -118.2673),
-        "time_zone": "America/Los_Angeles"
-    },
-    "Minnesota Wild": {
-        "city": "Saint Paul",
-        "coordinates": (44.9447, -93.1011),
-        "time_zone": "America/Chicago"
-    },
-    "Montreal Canadiens": {
-        "city": "Montreal",
-        "coordinates": (45.4960, -73.5693),
-        "time_zone": "America/Montreal"
-    },
-    "Nashville Predators": {
-        "city": "Nashville",
-        "coordinates": (36.1590, -86.7787),
-        "time_zone": "America/Chicago"
-    },
-    "New Jersey Devils": {
-        "city": "Newark",
-        "coordinates": (40.7336, -74.1711),
-        "time_zone": "America/New_York"
-    },
-    "New York Islanders": {
-        "city": "Elmont",
-        "coordinates": (40.7007, -73.7080),
-        "time_zone": "America/New_York"
-    },
-    "New York Rangers": {
-        "city": "New York",
-        "coordinates": (40.7505, -73.9934),
-        "time_zone": "America/New_York"
-    },
-    "Ottawa Senators": {
-        "city": "Ottawa",
-        "coordinates": (45.2969, -75.9273),
-        "time_zone": "America/Toronto"
-    },
-    "Philadelphia Flyers": {
-        "city": "Philadelphia",
-        "coordinates": (39.9012, -75.1720),
-        "time_zone": "America/New_York"
-    },
-    "Pittsburgh Penguins": {
-        "city": "Pittsburgh",
-        "coordinates": (40.4394, -79.9893),
-        "time_zone": "America/New_York"
-    },
-    "San Jose Sharks": {
-        "city": "San Jose",
-        "coordinates": (37.3329, -121.9012),
-        "time_zone": "America/Los_Angeles"
-    },
-    "Seattle Kraken": {
-        "city": "Seattle",
-        "coordinates": (47.6221, -122.3541),
-        "time_zone": "America/Los_Angeles"
-    },
-    "St. Louis Blues": {
-        "city": "St. Louis",
-        "coordinates": (38.6266, -90.2026),
-        "time_zone": "America/Chicago"
-    },
-    "Tampa Bay Lightning": {
-        "city": "Tampa",
-        "coordinates": (27.9428, -82.4519),
-        "time_zone": "America/New_York"
-    },
-    "Toronto Maple Leafs": {
-        "city": "Toronto",
-        "coordinates": (43.6435, -79.3791),
-        "time_zone": "America/Toronto"
-    },
-    "Vancouver Canucks": {
-        "city": "Vancouver",
-        "coordinates": (49.2778, -123.1088),
-        "time_zone": "America/Vancouver"
-    },
-    "Vegas Golden Knights": {
-        "city": "Las Vegas",
-        "coordinates": (36.1029, -115.1784),
-        "time_zone": "America/Los_Angeles"
-    },
-    "Washington Capitals": {
-        "city": "Washington",
-        "coordinates": (38.8981, -77.0209),
-        "time_zone": "America/New_York"
-    },
-    "Winnipeg Jets": {
-        "city": "Winnipeg",
-        "coordinates": (49.8951, -97.1384),
-        "time_zone": "America/Winnipeg"
-    }
-}
-
-# Function to calculate distance traveled
-def calculate_distance(home_team, opponent_team):
-    home_city_info = nhl_team_mapping.get(home_team, {})
-    opponent_city_info = nhl_team_mapping.get(opponent_team, {})
-
-    home_coords = home_city_info.get("coordinates", (0, 0))
-    opponent_coords = opponent_city_info.get("coordinates", (0, 0))
-
-    return geodesic(home_coords, opponent_coords).miles
-
-# Function to calculate time zone change
-def calculate_time_zone_change(home_team, opponent_team):
-    home_city_info = nhl_team_mapping.get(home_team, {})
-    opponent_city_info = nhl_team_mapping.get(opponent_team, {})
+    # Finished seasons never change, so only the in-progress window expires
+    try:
+        return list(pagination.iter_rows(url, ttl=http_cache.season_ttl(end_date)))
+    except RuntimeError:
+        print(f"Error fetching game history for {start_date} - {end_date}")
+        return []
+
+# Function to get only the finished games played from last_seen to end_date, always from the network
+@tracing.traced("fetch.games_since")
+def get_games_since(team_id, last_seen, end_date):
+    query = f"(homeTeamId={team_id} or visitingTeamId={team_id}) and gameDate>='{last_seen}' and gameDate<='{end_date}'"
+    encoded_query = urllib.parse.quote(query)
+    url = f"{BASE_URL}/game?cayenneExp={encoded_query}"
 
-    home_tz_name = home_city_info.get("time_zone", "UTC")
-    opponent_tz_name = opponent_city_info.get("time_zone", "UTC")
+    try:
+        games = list(pagination.iter_rows(url, ttl=0))
+    except RuntimeError:
+        print(f"Error fetching games after {last_seen}")
+        return []
+    # Scheduled and postponed games have no result yet
+    return [game for game in games if game.get("gameStateId", FINAL_GAME_STATE) == FINAL_GAME_STATE]
 
-    # Calculate time zone difference
-    home_tz = pytz.timezone(home_tz_name)
-    opponent_tz = pytz.timezone(opponent_tz_name)
-    return (opponent_tz.utcoffset(datetime.now()) - home_tz.utcoffset(datetime.now())).total_seconds() / 3600
+# Function to calculate distance traveled (a lookup into the precomputed arena matrix)
+def calculate_distance(home_team, opponent_team):
+    return travel_matrix.distance(home_team, opponent_team)
 
-# Function to calculate rest days
-def calculate_rest_days(previous_game_date, current_game_date):
-    if previous_game_date:
-        return (current_game_date - previous_game_date).days
-    return 0 
+# Function to calculate time zone change, using the offsets in effect on the game date
+def calculate_time_zone_change(home_team, opponent_team, game_date):
+    return travel_matrix.time_zone_change(home_team, opponent_team, game_date)
 
+@tracing.traced("transform.sort")
 def sort_by_date(game_data):
     """
     Sort the game data by the 'Game Date' field in ascending order.
+    Dates are parsed once when each record is built, so this is a plain key sort.
     """
-    return sorted(game_data, key=lambda x: datetime.strptime(x["Game Date"], "%Y-%m-%d"))
+    return game_record.sort_records(game_data)
 
 # Function to save game data to CSV
+@tracing.traced("write.csv")
 def save_to_csv(game_data, season):
     if not game_data:
         print(f"No data to save for season {season}.")
         return
 
     filename = f"canucks_game_history_{season}.csv"
-    fieldnames = [
-        "Season", "Game Location", "Opponent Team", "Distance Traveled (miles)",
-        "Time Zone Change", "Rest Days", "Goals Scored", "Goals Conceded", "Result", "Game Date", "City"
+    # Any game may lack these columns (its play-by-play or boxscore fetch failed), so check every record
+    extra_columns = [
+        column for column in play_by_play.PBP_COLUMNS + boxscore.BOX_COLUMNS
+        if any(column in record for record in game_data)
     ]
 
+    # Rows are serialized straight from the records, in game_record.CSV_COLUMNS order
     with open(filename, "w", newline="") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(game_data)
+        writer = csv.writer(csvfile)
+        writer.writerow(game_record.CSV_COLUMNS + extra_columns)
+        writer.writerows(record.csv_row(extra_columns) for record in game_data)
+    tracing.count("rows.written", len(game_data))
+
+# Function to turn raw /game rows into per-game entries from the team's perspective
+@tracing.traced("transform.build_rows")
+def build_game_rows(games, team_id, season):
+    game_data = []
+
+    for game in games:
+        if game["homeTeamId"] == team_id:
+            game_location, opponent_team_id = "Home", game["visitingTeamId"]
+            goals_scored, goals_conceded = game["homeScore"], game["visitingScore"]
+        else:
+            game_location, opponent_team_id = "Away", game["homeTeamId"]
+            goals_scored, goals_conceded = game["visitingScore"], game["homeScore"]
+        result = "Win" if goals_scored > goals_conceded else "Loss"
+
+        opponent_team = team_directory.get_team_name(opponent_team_id)
+        opponent_city = nhl_venue_mapping.get(opponent_team, {}).get("city", "Unknown")
+
+        game_data.append(game_record.GameRecord(
+            season, game_location, opponent_team, opponent_city, goals_scored, goals_conceded,
+            result, game["gameDate"], game.get("id"),
+        ))
+
+    return game_data
 
 # Function to process game data for a given season
-def process_season(team_id, start_year):
+@tracing.traced("season")
+def process_season(team_id, start_year, parquet_dir=None, with_play_by_play=False, with_shifts=False,
+                   start_date=None, end_date=None, with_boxscore=False):
     season = get_season_id(start_year)
-    start_date = f"{start_year}-10-01"
-    end_date = f"{start_year + 1}-04-15"
+    start_date = start_date or f"{start_year}-10-01"
+    end_date = end_date or f"{start_year + 1}-04-15"
 
     games = get_game_history(team_id, start_date, end_date)
-    game_data = []
+    game_data = build_game_rows(games, team_id, season)
 
-    for game in games:
-        opponent_team_id = game["visitingTeamId"] if game["homeTeamId"] == team_id else game["homeTeamId"]
-        game_location = "Home" if game["homeTeamId"] == team_id else "Away"
-        game_date = game['gameDate']
+    game_data = sort_by_date(game_data)
+    game_data = process_travel(game_data)
+    if with_play_by_play:
+        game_data = add_play_by_play(game_data, season)
+    if with_boxscore:
+        game_data = add_boxscores(game_data, team_id)
+    save_to_csv(game_data, season)
+    if parquet_dir:
+        with tracing.stage("write.parquet"):
+            storage.write_season(game_record.to_frame(game_data), season, TEAM_NAME, parquet_dir)
+    if with_shifts:
+        save_shift_reports(game_data, team_id, season)
+    record_last_game(team_id, game_data)
+    return game_data
+
+# Function to save per-player time on ice plus forward line and defence pair
+# combinations for a season, computed from the shift charts of its games
+def save_shift_reports(game_data, team_id, season):
+    shifts, positions = shift_charts.fetch_season_shifts(game_data)
+    if shifts.empty:
+        print(f"No shift charts found for season {season}.")
+        return
 
-        goals_scored = game["homeScore"] if game["homeTeamId"] == team_id else game["visitingScore"]
-        goals_conceded = game["visitingScore"] if game["homeTeamId"] == team_id else game["homeScore"]
-        result = "Win" if goals_scored > goals_conceded else "Loss"
+    toi = shift_charts.time_on_ice(shifts, team_id)
+    toi.insert(0, "Position", toi.index.map(positions))
+    toi.to_csv(f"canucks_toi_{season}.csv")
+
+    forwards, _ = shift_charts.line_combinations(shifts, positions, team_id, 3, shift_charts.FORWARD_POSITIONS)
+    defence, _ = shift_charts.line_combinations(shifts, positions, team_id, 2, shift_charts.DEFENCE_POSITIONS)
+    lines = pd.concat([forwards.assign(Unit="Forwards"), defence.assign(Unit="Defence")], ignore_index=True)
+    lines.to_csv(f"canucks_lines_{season}.csv", index=False)
+
+# Function to add per-game shot and goal counts from play-by-play, keeping the
+# season's compact event table next to the CSV
+@tracing.traced("fetch.play_by_play")
+def add_play_by_play(game_data, season):
+    events, game_teams = play_by_play.fetch_events(game_data)
+    play_by_play.save_events(events, game_teams, f"canucks_pbp_{season}.npz")
+    aggregates = play_by_play.shot_goal_aggregates(events, game_teams)
+    return play_by_play.join_aggregates(game_data, aggregates)
+
+# Function to add shots, saves, PIM, hits, blocks and power-play goals from each
+# game's boxscore; final games come from the cache after their first fetch
+@tracing.traced("fetch.boxscore")
+def add_boxscores(game_data, team_id):
+    payloads = boxscore.fetch_season_details(game_data)
+    return boxscore.join_details(game_data, payloads, team_id)
+
+# Function to remember the latest completed game stored for the team. Games
+# dated today may still be in progress, so they are fetched again next time.
+def record_last_game(team_id, game_data):
+    today = date.today()
+    completed = [record for record in game_data if record.game_date < today]
+    if not completed:
+        return
 
-        opponent_team = convert_id_to_team_name([{"Opponent Team": opponent_team_id}])[0]["Opponent Team"]
-        opponent_city = nhl_team_mapping.get(opponent_team, {}).get("city", "Unknown")
+    last_game = max(completed, key=lambda record: record.game_date)
+    sync_state.save_team_state(team_id, last_game.game_date.isoformat(), last_game.game_id)
 
-        game_entry = {
-            "Season": season,
-            "Game Location": game_location,
-            "Opponent Team": opponent_team,
-            "City": opponent_city,
-            "Distance Traveled (miles)": calculate_distance(TEAM_NAME, opponent_team),
-            "Time Zone Change": calculate_time_zone_change(TEAM_NAME, opponent_team),
-            "Goals Scored": goals_scored,
-            "Goals Conceded": goals_conceded,
-            "Result": result,
-            "Game Date": game_date
-        }
+# Function to read a season CSV written by save_to_csv back into row dicts
+def load_season_csv(season):
+    filename = f"canucks_game_history_{season}.csv"
+    if not os.path.exists(filename):
+        return []
+    with open(filename, newline="") as csvfile:
+        return list(csv.DictReader(csvfile))
+
+# Function to refresh the current season with only the games played since the last run
+def update_current_season(team_id, parquet_dir=None, with_play_by_play=False, with_boxscore=False):
+    today = date.today()
+    start_year = today.year if today.month >= 7 else today.year - 1
+    season = get_season_id(start_year)
+    # Games dated today may still be in progress, so stop at yesterday
+    end_date = min(f"{start_year + 1}-06-30", (today - timedelta(days=1)).isoformat())
+
+    state = sync_state.get_team_state(team_id)
+    if not state or state["lastGameDate"] < f"{start_year}-07-01":
+        # Nothing stored for this season yet, so fetch it whole
+        print(f"No previous sync for season {season}, fetching it in full...")
+        process_season(team_id, start_year, parquet_dir, with_play_by_play, with_boxscore=with_boxscore)
+        return
 
-        game_data.append(game_entry)
+    # The last stored game is matched by ID, so a later game on the same date is not missed
+    games = [
+        game for game in get_games_since(team_id, state["lastGameDate"], end_date)
+        if game.get("id") != state.get("lastGameId")
+    ]
+    new_rows = build_game_rows(games, team_id, season)
+    print(f"Fetched {len(new_rows)} new games since {state['lastGameDate']}.")
+    if not new_rows:
+        return
 
-    game_data = sort_by_date(game_data)
+    # Upsert: a fetched game replaces the stored row with the same Game ID
+    new_ids = {record.game_id for record in new_rows}
+    stored_rows = [
+        record for record in map(game_record.GameRecord.from_row, load_season_csv(season))
+        if record.game_id not in new_ids
+    ]
+
+    # Travel depends on the previous game, so the season's travel columns are recomputed
+    game_data = process_travel(sort_by_date(stored_rows + new_rows))
+    if with_play_by_play:
+        # Events for games already stored come straight from the response cache
+        game_data = add_play_by_play(game_data, season)
+    if with_boxscore:
+        game_data = add_boxscores(game_data, team_id)
     save_to_csv(game_data, season)
+    if parquet_dir:
+        storage.write_season(game_record.to_frame(game_data), season, TEAM_NAME, parquet_dir)
+    record_last_game(team_id, game_data)
 
-# Function to process travel data for the seasons
+# Function to process travel data for the seasons: distance and time zone shift
+# from the previous game's venue, rest days, back-to-backs and road trip totals
+@tracing.traced("transform.travel")
 def process_travel(game_data):
-    home_team = "Vancouver Canucks"
-    previous_game_date = None
+    if not game_data:
+        return game_data
+    frame = game_record.to_frame(game_data)
+    frame["_position"] = range(len(game_data))
+    return game_record.apply_travel(game_data, travel.compute_travel(frame, TEAM_NAME))
+
+# Function to fetch and save one season, used as the per-season worker
+def fetch_season(team_id, start_year, parquet_dir=None, with_play_by_play=False, with_shifts=False,
+                 with_boxscore=False):
+    print(f"Fetching season {start_year}-{start_year + 1}...")
+    process_season(team_id, start_year, parquet_dir, with_play_by_play, with_shifts, with_boxscore=with_boxscore)
+
+# Function to fetch one season's raw games and hand them to the enrichment
+# stage as a typed column file
+def fetch_season_table(team_id, work_dir, start_year):
+    print(f"Fetching season {get_season_id(start_year)}...")
+    games = get_game_history(team_id, f"{start_year}-10-01", f"{start_year + 1}-04-15")
+    return start_year, pipeline.save_games_table(games, os.path.join(work_dir, f"games_{start_year}.npz"))
+
+# Function to enrich and write one fetched season; runs in a worker process, so
+# it returns only a small summary and the parent records the sync state
+def enrich_season_table(team_id, parquet_dir, fetched):
+    start_year, path = fetched
+    season = get_season_id(start_year)
+    game_data = build_game_rows(pipeline.load_games_table(path), team_id, season)
+    game_data = process_travel(sort_by_date(game_data))
+    save_to_csv(game_data, season)
+    if parquet_dir:
+        storage.write_season(game_record.to_frame(game_data), season, TEAM_NAME, parquet_dir)
+
+    completed = [record for record in game_data if record.game_date < date.today()]
+    last_game = max(completed, key=lambda record: record.game_date) if completed else None
+    return {
+        "season": season,
+        "rows": len(game_data),
+        "lastGameDate": last_game.game_date.isoformat() if last_game else None,
+        "lastGameId": last_game.game_id if last_game else None,
+    }
 
-    for game in game_data:
-        game_date = datetime.strptime(game["Game Date"], "%Y-%m-%d")
+# Function to fetch seasons on threads while worker processes enrich the ones
+# already fetched
+def run_process_pipeline(team_id, start_years, processes, concurrency=None, parquet_dir=None):
+    teams = team_directory.load_teams()
+    if teams is None:
+        return
+    with tempfile.TemporaryDirectory(prefix="canucks-pipeline-") as work_dir:
+        results = pipeline.run_pipeline(
+            partial(fetch_season_table, team_id, work_dir),
+            partial(enrich_season_table, team_id, parquet_dir),
+            start_years,
+            processes=processes,
+            concurrency=concurrency,
+            initializer=team_directory.set_teams,
+            initargs=(teams,),
+        )
+    for result in results:
+        if result["lastGameDate"]:
+            sync_state.save_team_state(team_id, result["lastGameDate"], result["lastGameId"])
+
+# Function to build the team's full history season by season, from the franchise's
+# first season (or first_year) to the latest one, using each season's real start
+# and end dates. Finished seasons are checkpointed, so a restart skips them.
+def backfill(team_id, first_year=None, parquet_dir=None, with_play_by_play=False, with_shifts=False,
+             with_boxscore=False):
+    first_year = first_year or seasons.franchise_first_year(team_id)
+    if first_year is None:
+        # Never fall back to "every season since 1917" for an unknown franchise
+        print(f"Backfill aborted: no franchise found for team {team_id}; pass the first year, e.g. --backfill 1970.")
+        return
+    windows = seasons.seasons_since(first_year)
+    if windows is None:
+        return
 
-        if game["Game Location"] == "Away":
-            opponent_team = game["Opponent Team"]
-            game["Distance Traveled (miles)"] = calculate_distance(home_team, opponent_team)
-            game["Time Zone Change"] = calculate_time_zone_change(home_team, opponent_team)
-        else:
-            game["Distance Traveled (miles)"] = 0
-            game["Time Zone Change"] = 0
+    completed = sync_state.completed_seasons(team_id)
+    pending = [window for window in windows if window["id"] not in completed]
+    print(f"Backfill: {len(windows) - len(pending)} of {len(windows)} seasons already complete.")
+    today = date.today().isoformat()
 
-        game["Rest Days"] = calculate_rest_days(previous_game_date, game_date)
-        previous_game_date = game_date
+    def run(window):
+        print(f"Fetching season {get_season_id(window['startYear'])} ({window['startDate']} - {window['endDate']})...")
+        game_data = process_season(
+            team_id, window["startYear"], parquet_dir, with_play_by_play, with_shifts,
+            window["startDate"], window["endDate"], with_boxscore,
+        )
+        # An empty result may be a failed fetch, and the current season is still changing
+        if game_data and window["endDate"] < today:
+            sync_state.mark_season_complete(team_id, window["id"], len(game_data))
+
+    fetch_engine.run_concurrently(run, pending)
 
 # Main function to fetch data for multiple seasons
-def main():
+def main(concurrency=fetch_engine.DEFAULT_CONCURRENCY, rate=fetch_engine.DEFAULT_RATE, parquet_dir=None,
+         update=False, league_mode=False, with_play_by_play=False, with_shifts=False, backfill_from=None,
+         processes=None, with_boxscore=False, start_years=None):
+    start_years = start_years or range(2010, 2024)
+
+    # Seasons run in parallel; the shared token bucket keeps the API request rate polite
+    fetch_engine.configure(concurrency=concurrency, rate=rate)
+
+    # Build (or load) the travel lookup tables once here, so season threads
+    # and worker processes only ever read them from the cache
+    travel_matrix.offset_table()
+    travel_matrix.distance_matrix()
+
+    if league_mode:
+        # One paged /game pull per season covers all 32 teams
+        if parquet_dir == settings.DATASET_DIR:
+            parquet_dir = league.LEAGUE_DATASET_DIR
+        # load_teams is not locked, so fetch the team list before the season threads read it
+        if team_directory.load_teams() is None:
+            return
+        fetch_engine.run_concurrently(
+            lambda start_year: league.process_league_season(start_year, parquet_dir=parquet_dir), start_years
+        )
+        return
+
     team_id = get_team_id()
     if not team_id:
         return
 
-    for start_year in range(2010, 2024): 
-        print(f"Fetching season {start_year}-{start_year + 1}...")
-        process_season(team_id, start_year)
-        time.sleep(1)  
+    if update:
+        update_current_season(team_id, parquet_dir, with_play_by_play, with_boxscore)
+        return
+
+    if backfill_from is not None:
+        backfill(team_id, backfill_from or None, parquet_dir, with_play_by_play, with_shifts, with_boxscore)
+        return
+
+    if processes:
+        if with_play_by_play or with_shifts or with_boxscore:
+            print("Play-by-play, boxscores and shift charts are fetched per game, so they run without worker processes.")
+        else:
+            run_process_pipeline(team_id, start_years, processes, concurrency, parquet_dir)
+            return
+
+    fetch_engine.run_concurrently(
+        lambda start_year: fetch_season(team_id, start_year, parquet_dir, with_play_by_play, with_shifts, with_boxscore),
+        start_years,
+    )
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fetch Canucks game history for multiple seasons.")
+    parser.add_argument("--offline", action="store_true", help="Serve every request from the local response cache only")
+    parser.add_argument("--concurrency", type=int, default=fetch_engine.DEFAULT_CONCURRENCY, help="Number of seasons fetched in parallel")
+    parser.add_argument("--rate", type=float, default=fetch_engine.DEFAULT_RATE, help="Maximum API requests per second")
+    parser.add_argument("--parquet", nargs="?", const=settings.DATASET_DIR, metavar="DIR", help="Also write a season-partitioned Parquet dataset")
+    parser.add_argument("--season", type=int, action="append", metavar="START_YEAR", help="Fetch only this season, e.g. 2023 for 2023-2024 (repeatable)")
+    parser.add_argument("--update", action="store_true", help="Only fetch current-season games played since the last run")
+    parser.add_argument("--league", action="store_true", help="Fetch every team's games, written per team under league_game_history/")
+    parser.add_argument("--play-by-play", action="store_true", help="Add shot and goal counts from each game's play-by-play")
+    parser.add_argument("--boxscore", action="store_true", help="Add shots, saves, PIM, hits, blocks and power-play goals from each game's boxscore")
+    parser.add_argument("--shifts", action="store_true", help="Also write time on ice and line combinations from shift charts")
+    parser.add_argument("--backfill", nargs="?", type=int, const=0, metavar="FIRST_YEAR", help="Resumable backfill of every season since the franchise's first (or FIRST_YEAR)")
+    parser.add_argument("--processes", nargs="?", type=int, const=os.cpu_count(), metavar="N", help="Enrich fetched seasons in N worker processes (default: one per core)")
+    parser.add_argument("--trace", metavar="REPORT", help="Write per-stage timings and request latencies to this JSON file")
+    parser.add_argument("--profile", action="store_true", help="With --trace, include a cProfile summary")
+    parser.add_argument("--trace-memory", action="store_true", help="With --trace, include tracemalloc peak and top allocations")
+    args = parser.parse_args()
+    if args.offline:
+        http_cache.set_offline()
+    if args.trace:
+        tracing.enable(profile=args.profile, memory=args.trace_memory)
+    main(
+        concurrency=args.concurrency,
+        rate=args.rate,
+        parquet_dir=args.parquet,
+        update=args.update,
+        league_mode=args.league,
+        with_play_by_play=args.play_by_play,
+        with_shifts=args.shifts,
+        backfill_from=args.backfill,
+        processes=args.processes,
+        with_boxscore=args.boxscore,
+        start_years=args.season,
+    )
+    if args.trace:
+        tracing.write_report(args.trace, http_cache=dict(http_cache.stats))
@@ -0,0 +1,66 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+import fetch_engine
+import http_cache
+import player_stats
+import team_directory
+
+TEAM_NAME = "Vancouver Canucks"
+
+
+# Function to print query results as a simple aligned table
+def print_rows(rows):
+    if not rows:
+        print("No rows.")
+        return
+    columns = rows[0].keys()
+    print("  ".join(f"{column:>14}" for column in columns))
+    for row in rows:
+        print("  ".join(f"{'' if row[column] is None else row[column]!s:>14}" for column in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Player season stats warehouse built on the skater/goalie summary endpoints.")
+    parser.add_argument("--db", default=player_stats.DATABASE_FILE, help="SQLite warehouse file")
+    parser.add_argument("--offline", action="store_true", help="Serve every request from the local response cache only")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    load = subparsers.add_parser("load", help="Bulk-load seasons into the warehouse")
+    load.add_argument("--first", type=int, default=2010, help="First season start year")
+    load.add_argument("--last", type=int, default=2023, help="Last season start year")
+    load.add_argument("--concurrency", type=int, default=fetch_engine.DEFAULT_CONCURRENCY)
+
+    career = subparsers.add_parser("career", help="Career totals for players matching a name")
+    career.add_argument("name")
+    career.add_argument("--goalie", action="store_true")
+
+    leaders = subparsers.add_parser("leaders", help="Season leaders for one stat")
+    leaders.add_argument("season", type=int, help="Season ID, e.g. 20232024")
+    leaders.add_argument("--stat", default="points")
+    leaders.add_argument("--limit", type=int, default=10)
+    leaders.add_argument("--canucks", action="store_true", help=f"Only players who played for the {TEAM_NAME}")
+    leaders.add_argument("--goalie", action="store_true")
+
+    args = parser.parse_args()
+    if args.offline:
+        http_cache.set_offline()
+    conn = player_stats.connect(args.db)
+
+    if args.command == "load":
+        fetch_engine.configure(concurrency=args.concurrency)
+        stored = player_stats.load_seasons(conn, range(args.first, args.last + 1))
+        print(f"Stored {stored} player seasons in {args.db}")
+    elif args.command == "career":
+        print_rows(player_stats.career_totals(conn, name=args.name, goalie=args.goalie))
+    elif args.command == "leaders":
+        team_id = team_directory.get_team_id_by_name(TEAM_NAME) if args.canucks else None
+        print_rows(player_stats.season_leaders(
+            conn, args.season, stat=args.stat, limit=args.limit, team_id=team_id, goalie=args.goalie
+        ))
+
+
+if __name__ == "__main__":
+    main()
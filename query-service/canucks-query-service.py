@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from lazy import lazy_import
+
+game_index = lazy_import("game_index")
+
+NUMBER_PARAMS = {"min_rest", "max_rest"}
+
+
+def parse_filters(query):
+    """
+    Turns a query string into GameIndex filters, e.g.
+    ?location=Away&max_rest=1&conference=Eastern&from=2015-10-01
+
+    :param query: Dict of parameter -> list of values (urllib.parse.parse_qs)
+    :return: (filters dict, limit, group key)
+    """
+    filters = {}
+    for key, values in query.items():
+        if key in ("limit", "by"):
+            continue
+        # Value filters take a list (comma-separated or repeated)
+        if key in game_index.VALUE_FILTERS:
+            filters[key] = [value for item in values for value in item.split(",") if value]
+        elif key in NUMBER_PARAMS:
+            filters[key] = float(values[-1])
+        elif key == "back_to_back":
+            filters[key] = values[-1].lower() in ("1", "true", "yes")
+        else:
+            filters[key] = values[-1]
+    limit = int(query["limit"][-1]) if "limit" in query else None
+    by = query.get("by", [None])[-1]
+    return filters, limit, by
+
+
+def make_server(index, host="127.0.0.1", port=8080):
+    """
+    HTTP/JSON front end over a ReloadingIndex.
+
+    GET /games?...      matching games (optionally ?limit=N)
+    GET /aggregate?...  games, wins, win rate, goals and travel (optionally ?by=opponent)
+    GET /health         row count, seasons and when the data was last loaded
+
+    :param index: game_index.ReloadingIndex
+    :return: ThreadingHTTPServer (call serve_forever())
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parts = urllib.parse.urlsplit(self.path)
+            current = index.index
+            start = time.perf_counter()
+            try:
+                filters, limit, by = parse_filters(urllib.parse.parse_qs(parts.query))
+                if parts.path == "/games":
+                    rows = current.rows(current.select(filters), limit)
+                    body = {"count": len(rows), "rows": rows}
+                elif parts.path == "/aggregate":
+                    body = {"result": current.aggregate(current.select(filters), by)}
+                elif parts.path == "/health":
+                    body = {"rows": current.size, "seasons": current.seasons, "loadedAt": index.loaded_at}
+                else:
+                    self._send(404, {"error": "not found"})
+                    return
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+                return
+            body["elapsedMicroseconds"] = round((time.perf_counter() - start) * 1e6, 1)
+            self._send(200, body)
+
+        def _send(self, status, body):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the per-season game history CSVs as a local JSON query API.")
+    parser.add_argument("--data-dir", default=".", help="Directory holding canucks_game_history_*.csv")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--reload-interval", type=float, default=2.0, help="Seconds between checks for new season files")
+    args = parser.parse_args()
+
+    index = game_index.ReloadingIndex(args.data_dir, args.reload_interval).start()
+    server = make_server(index, args.host, args.port)
+    print(f"Loaded {index.index.size} games; listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        index.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+import fetch_engine
+import http_cache
+import seasons
+from lazy import lazy_import
+
+pd = lazy_import("pandas")
+club_schedule = lazy_import("club_schedule")
+travel = lazy_import("travel")
+
+TEAM_NAME = "Vancouver Canucks"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Project travel and rest for every remaining game on the schedule.")
+    parser.add_argument("--team", action="append", help=f"Full team name (repeatable; default {TEAM_NAME})")
+    parser.add_argument("--all-teams", action="store_true", help="Project every active club (from /franchise)")
+    parser.add_argument("--season", type=int, help="Season in YYYYYYYY format (default: the current season)")
+    parser.add_argument("--from-date", help="First date to project, YYYY-MM-DD (default: today)")
+    parser.add_argument("--output", help="Write the per-game projection to this CSV")
+    parser.add_argument("--offline", action="store_true", help="Serve every request from the local response cache only")
+    parser.add_argument("--concurrency", type=int, default=fetch_engine.DEFAULT_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=fetch_engine.DEFAULT_RATE, help="Maximum API requests per second")
+    args = parser.parse_args()
+
+    if args.offline:
+        http_cache.set_offline()
+    fetch_engine.configure(concurrency=args.concurrency, rate=args.rate)
+
+    teams = args.team or [TEAM_NAME]
+    if args.all_teams:
+        active = seasons.active_teams()
+        if not active:
+            print("Could not determine the active clubs.")
+            return
+        teams = [team["fullName"] for team in active]
+    projection = club_schedule.project_teams(teams, args.season, args.from_date)
+    if projection.empty:
+        print("No remaining games found.")
+        return
+
+    if args.output:
+        projection.to_csv(args.output, index=False)
+        print(f"Wrote {len(projection)} projected games to {args.output}")
+
+    with pd.option_context("display.width", 120, "display.max_rows", None):
+        if len(teams) == 1:
+            print(projection[["Game Date", "Game Location", "Opponent Team"] + travel.TRAVEL_COLUMNS]
+                  .to_string(index=False))
+        print(club_schedule.fatigue_summary(projection).round(1).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,30 @@
-import requests
+import argparse
 import json
 import csv
+import os
+import sys
 
-BASE_URL = "https://api.nhle.com/stats/rest/en"
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+import http_cache
+import pagination
+import team_directory
+
+BASE_URL = http_cache.BASE_URL
 TEAM_NAME = "Vancouver Canucks"
 
 # Function to get all teams and retrieve Canucks' team ID
 def get_team_id():
-    response = requests.get(f"{BASE_URL}/team")
-    if response.status_code == 200:
-        teams = response.json().get("data", [])
-        for team in teams:
-            if team["fullName"] == TEAM_NAME:
-                return team["id"]
-    print("Error fetching team data.")
-    return None
+    team_id = team_directory.get_team_id_by_name(TEAM_NAME)
+    if team_id is None:
+        print("Error fetching team data.")
+    return team_id
 
 # Funtions to conver the team ID into teamName
 def converIdtoFullTeamName(file):
-    response = requests.get(f"{BASE_URL}/team")
-    
-    if response.status_code == 200:
-        teams = response.json().get("data", [])
-        
-        # Create a mapping of teamId -> fullName
-        team_id_map = {team["id"]: team["fullName"] for team in teams}
-        
+    # Shared mapping of teamId -> fullName, fetched once per run
+    team_id_map = team_directory.get_team_id_map()
+
+    if team_id_map is not None:
         # Replace Opponent Team ID with Full Team Name
         for game in file:
             team_id = game["Opponent Team"]
@@ -38,7 +37,7 @@ def converIdtoFullTeamName(file):
 
 # Function to get current season
 def get_latest_season():
-    response = requests.get(f"{BASE_URL}/season")
+    response = http_cache.get(f"{BASE_URL}/season", ttl=24 * 60 * 60)
     if response.status_code == 200:
         seasons = response.json().get("data", [])
         return max(seasons, key=lambda x: x["formattedSeasonId"])["formattedSeasonId"]  # Latest season
@@ -60,8 +59,6 @@ def get_season_from_dates(start_date, end_date):
 
 import urllib.parse
 
-BASE_URL = "https://api.nhle.com/stats/rest/en"
-
 def get_game_history(team_id, start_date, end_date):
     """
     Fetches game history for a given team between start_date and end_date.
@@ -75,22 +72,12 @@ def get_game_history(team_id, start_date, end_date):
     encoded_query = urllib.parse.quote(query)
     url = f"{BASE_URL}/game?cayenneExp={encoded_query}"
 
-    response = requests.get(url)
-    # print(f"Request URL: {url}")  # Debugging
-    # print(f"Response Status Code: {response.status_code}")
-    
-    if response.status_code == 200:
-        return response.json().get("data", [])
-    
-    print(f"Error fetching game history: {response.text}")
-    return []
-
-# Example usage
-team_id = 23  # Vancouver Canucks
-start_date = "2023-10-01"  # Example start date
-end_date = "2024-04-15"  # Example end date
-games = get_game_history(team_id, start_date, end_date)
-print("This is the games:", games)
+    # Pages through start/limit until the response's "total" is reached
+    try:
+        return list(pagination.iter_rows(url, ttl=http_cache.season_ttl(end_date)))
+    except RuntimeError as e:
+        print(f"Error fetching game history: {e}")
+        return []
 
 # -----------------------------------------
 
@@ -180,4 +167,9 @@ def main():
         save_to_csv(game_data, season)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch Canucks game history for a single season.")
+    parser.add_argument("--offline", action="store_true", help="Serve every request from the local response cache only")
+    args = parser.parse_args()
+    if args.offline:
+        http_cache.set_offline()
     main()